@@ -0,0 +1,279 @@
+import argparse
+import asyncio
+import contextlib
+import csv
+import importlib.util
+import io
+import itertools
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+# Harness único de benchmark das três abordagens. Cada combinação da grade
+# (modo, engine, intervalo, workers) roda em um processo Python novo, para que
+# tempo de CPU, pico de memória e caches (tabela de primos, expoentes de
+# Mersenne, pool de processos) de uma combinação não contaminem a seguinte.
+# Dentro dele, as execuções de aquecimento são descartadas e as repetições são
+# medidas com time.perf_counter. O cache de somas de divisores das abordagens
+# fica desligado, como é o padrão delas, para que cada repetição meça o cálculo;
+# com --cache-somas, ele é ligado no processo filho antes das execuções.
+#
+# Os resultados vão para um CSV (uma linha por combinação, com a coluna
+# tempo_execucao = mediana, lida por comparacao.py) e um JSON com os tempos de
+# cada repetição.
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modo -> (diretório, arquivo do módulo). Os modos do Paralelo usam o nome do
+# executor de analisar_intervalo_paralelo.
+MODOS = {
+    'sequencial': ('Sequencial', 'perfectOrFriendlyTempo.py'),
+    'threads': ('Paralelo', 'perfect_or_friendly_paralelo.py'),
+    'processos': ('Paralelo', 'perfect_or_friendly_paralelo.py'),
+    'memoria_compartilhada': ('Paralelo', 'perfect_or_friendly_paralelo.py'),
+    'distribuido': ('Distribuido', 'serverTempo.py'),
+}
+
+# Os clientes do modo distribuído sempre usam o crivo segmentado.
+ENGINE_DISTRIBUIDO = 'segmentado'
+
+# O que é medido nos modos locais: a análise completa do intervalo
+# (analisar_intervalo / analisar_intervalo_paralelo) ou só a busca de pares
+# (encontrar_pares_amigaveis / encontrar_pares_amigaveis_paralelo).
+ALVOS = ('intervalo', 'pares')
+
+ARQUIVO_SAIDA_PADRAO = 'resultados_benchmark'
+PORTA_PADRAO = 12345
+
+# Tempo máximo (em segundos) para os clientes locais se conectarem.
+TIMEOUT_CONEXAO_CLIENTES = 30.0
+
+COLUNAS_CSV = ['modo', 'alvo', 'engine', 'workers', 'intervalo', 'inicio', 'fim', 'repeticoes', 'tempo_execucao',
+               'tempo_mediana', 'tempo_media', 'tempo_p95', 'tempo_desvio', 'tempo_minimo', 'tempo_maximo',
+               'vazao', 'tempo_cpu', 'pico_rss_mb', 'pico_rss_filhos_mb']
+
+# Carrega um módulo das abordagens pelo caminho do arquivo. O diretório entra no
+# sys.path para os imports locais do módulo (checkpoint, protocolo, ...) e para
+# que processos filhos encontrem as funções enviadas ao pool pelo nome.
+def carregar_modulo(diretorio, arquivo):
+    caminho_diretorio = os.path.join(RAIZ, diretorio)
+    if caminho_diretorio not in sys.path:
+        sys.path.insert(0, caminho_diretorio)
+    nome = os.path.splitext(arquivo)[0]
+    spec = importlib.util.spec_from_file_location(nome, os.path.join(caminho_diretorio, arquivo))
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nome] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+# Pico de memória residente em MB (ru_maxrss é dado em KB no Linux e em bytes no macOS).
+def pico_rss_mb(quem):
+    pico = resource.getrusage(quem).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+def tempo_cpu_filhos():
+    uso = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return uso.ru_utime + uso.ru_stime
+
+# Mede as repetições de uma função sem argumentos, descartando o aquecimento.
+# O tempo de CPU inclui os processos filhos já encerrados (pool local).
+def medir(funcao, repeticoes, aquecimento):
+    for _ in range(aquecimento):
+        funcao()
+
+    tempos = []
+    tempos_cpu = []
+    for _ in range(repeticoes):
+        cpu_inicio = time.process_time() + tempo_cpu_filhos()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+        tempos_cpu.append(time.process_time() + tempo_cpu_filhos() - cpu_inicio)
+    return tempos, statistics.mean(tempos_cpu)
+
+def executar_local(config):
+    diretorio, arquivo = MODOS[config['modo']]
+    modulo = carregar_modulo(diretorio, arquivo)
+    if config['engine'] not in modulo.ENGINES:
+        raise ValueError(f"A engine {config['engine']!r} não existe no modo {config['modo']!r}")
+    if config.get('cache_somas'):
+        modulo.configurar_cache_somas()
+
+    alvo = config.get('alvo', 'intervalo')
+    if config['modo'] == 'sequencial' and alvo == 'pares':
+        def funcao():
+            modulo.encontrar_pares_amigaveis(config['fim'], config['engine'])
+    elif config['modo'] == 'sequencial':
+        def funcao():
+            modulo.analisar_intervalo(config['inicio'], config['fim'], config['engine'])
+    elif alvo == 'pares':
+        def funcao():
+            modulo.encontrar_pares_amigaveis_paralelo(config['fim'], config['workers'], config['engine'],
+                                                      executor=config['modo'])
+    else:
+        def funcao():
+            modulo.analisar_intervalo_paralelo(config['inicio'], config['fim'], config['workers'],
+                                               config['engine'], config['modo'])
+
+    # As funções das abordagens imprimem o progresso; a saída do harness é só o JSON.
+    with contextlib.redirect_stdout(io.StringIO()):
+        tempos, tempo_cpu = medir(funcao, config['repeticoes'], config['aquecimento'])
+    # Vazio quando o cache está desligado.
+    return tempos, tempo_cpu, modulo.estatisticas_cache_somas()
+
+# Modo distribuído sobre localhost: coordenador neste processo e `workers`
+# clientes (um núcleo cada) em subprocessos. Os clientes se conectam uma vez e
+# atendem a todas as repetições; cada repetição mede a distribuição inteira.
+# O tempo de CPU dos clientes só é conhecido quando eles terminam, então aqui
+# ele é a média por execução, aquecimento incluído. Os clientes não usam o cache
+# de somas de divisores.
+def executar_distribuido(config):
+    diretorio, arquivo = MODOS['distribuido']
+    servidor = carregar_modulo(diretorio, arquivo)
+    cliente = os.path.join(RAIZ, diretorio, 'client.py')
+
+    cpu_inicio = time.process_time() + tempo_cpu_filhos()
+    with contextlib.redirect_stdout(io.StringIO()):
+        coordenador = servidor.Coordenador(port=config['porta'], porta_metricas=None)
+        coordenador.iniciar()
+        processos = [subprocess.Popen([sys.executable, cliente, '--workers', '1', '--port', str(config['porta'])],
+                                      cwd=os.path.dirname(cliente), stdout=subprocess.DEVNULL)
+                     for _ in range(config['workers'])]
+        try:
+            coordenador.executar(asyncio.wait_for(coordenador.aguardar_trabalhadores_async(config['workers']),
+                                                  TIMEOUT_CONEXAO_CLIENTES))
+            tempos, _ = medir(lambda: coordenador.executar_distribuicao(config['inicio'], config['fim']),
+                              config['repeticoes'], config['aquecimento'])
+        finally:
+            coordenador.encerrar()
+            for processo in processos:
+                processo.wait()
+
+    execucoes = config['repeticoes'] + config['aquecimento']
+    return tempos, (time.process_time() + tempo_cpu_filhos() - cpu_inicio) / execucoes, {}
+
+# Executa uma combinação da grade (no processo filho) e devolve as métricas.
+def executar_config(config):
+    if config['modo'] == 'distribuido':
+        tempos, tempo_cpu, estatisticas_cache = executar_distribuido(config)
+    else:
+        tempos, tempo_cpu, estatisticas_cache = executar_local(config)
+
+    mediana = statistics.median(tempos)
+    if len(tempos) > 1:
+        p95 = statistics.quantiles(tempos, n=20, method='inclusive')[18]
+        desvio = statistics.stdev(tempos)
+    else:
+        p95, desvio = tempos[0], 0.0
+
+    return {
+        **config,
+        'intervalo': f"{config['inicio']}-{config['fim']}",
+        'tempos': tempos,
+        'tempo_execucao': mediana,
+        'tempo_mediana': mediana,
+        'tempo_media': statistics.mean(tempos),
+        'tempo_p95': p95,
+        'tempo_desvio': desvio,
+        'tempo_minimo': min(tempos),
+        'tempo_maximo': max(tempos),
+        'vazao': (config['fim'] - config['inicio'] + 1) / mediana,
+        'tempo_cpu': tempo_cpu,
+        'pico_rss_mb': pico_rss_mb(resource.RUSAGE_SELF),
+        'pico_rss_filhos_mb': pico_rss_mb(resource.RUSAGE_CHILDREN),
+        'estatisticas_cache': estatisticas_cache,
+    }
+
+# Grade de combinações. Engine e workers que não se aplicam a um modo (workers
+# no sequencial, engine no distribuído) não geram combinações repetidas.
+def montar_grade(args):
+    grade = []
+    for modo, fim, engine, workers in itertools.product(args.modos, args.intervalos, args.engines, args.workers):
+        config = {
+            'modo': modo,
+            'engine': ENGINE_DISTRIBUIDO if modo == 'distribuido' else engine,
+            'workers': 1 if modo == 'sequencial' else workers,
+            'inicio': args.inicio,
+            'fim': fim,
+            'repeticoes': args.repeticoes,
+            'aquecimento': args.aquecimento,
+            'porta': args.porta,
+            'alvo': args.alvo,
+            'cache_somas': args.cache_somas,
+        }
+        if config not in grade:
+            grade.append(config)
+    return grade
+
+# Roda uma combinação em um processo Python novo e devolve o seu resultado.
+def executar_em_processo(config):
+    processo = subprocess.run([sys.executable, os.path.abspath(__file__), '--config', json.dumps(config)],
+                              capture_output=True, text=True)
+    if processo.returncode != 0:
+        erro = processo.stderr.strip().splitlines()
+        raise RuntimeError(erro[-1] if erro else f"código de saída {processo.returncode}")
+    return json.loads(processo.stdout.strip().splitlines()[-1])
+
+def salvar_resultados(resultados, saida):
+    with open(saida + '.csv', 'w', newline='', encoding='utf-8') as arquivo:
+        writer = csv.DictWriter(arquivo, fieldnames=COLUNAS_CSV, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(resultados)
+    with open(saida + '.json', 'w', encoding='utf-8') as arquivo:
+        json.dump(resultados, arquivo, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das abordagens sequencial, paralela e distribuída")
+    parser.add_argument('--modos', nargs='+', choices=list(MODOS), default=list(MODOS))
+    parser.add_argument('--engines', nargs='+', default=['crivo'])
+    parser.add_argument('--intervalos', nargs='+', type=int, default=[100000, 250000, 500000, 750000, 1000000],
+                        help="fins dos intervalos testados")
+    parser.add_argument('--inicio', type=int, default=1)
+    parser.add_argument('--workers', nargs='+', type=int, default=[os.cpu_count() or 1],
+                        help="threads/processos (paralelo) ou clientes (distribuído)")
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--aquecimento', type=int, default=1)
+    parser.add_argument('--porta', type=int, default=PORTA_PADRAO)
+    parser.add_argument('--alvo', choices=ALVOS, default='intervalo',
+                        help="análise completa do intervalo ou só a busca de pares amigáveis")
+    parser.add_argument('--cache-somas', action='store_true',
+                        help="liga o cache de somas de divisores nos modos locais (repetições mornas)")
+    parser.add_argument('--saida', default=ARQUIVO_SAIDA_PADRAO,
+                        help="prefixo dos arquivos de saída (.csv e .json)")
+    parser.add_argument('--instrumentacao', metavar='CAMINHO',
+                        help="liga a instrumentação e acrescenta o resumo de cada processo a CAMINHO (JSON por linha)")
+    parser.add_argument('--config', help=argparse.SUPPRESS) # Uso interno: uma combinação no processo filho
+    args = parser.parse_args()
+
+    if args.config is not None:
+        print(json.dumps(executar_config(json.loads(args.config))))
+        return
+
+    # Os processos filhos (e os clientes do modo distribuído) herdam a variável
+    # de ambiente e ligam a instrumentação ao importar instrumentacao.py.
+    if args.instrumentacao:
+        os.environ['INSTRUMENTACAO'] = os.path.abspath(args.instrumentacao)
+
+    resultados = []
+    for config in montar_grade(args):
+        descricao = f"{config['modo']} engine={config['engine']} workers={config['workers']} 1-{config['fim']}"
+        try:
+            resultado = executar_em_processo(config)
+        except RuntimeError as erro:
+            print(f"{descricao}: falhou ({erro})")
+            continue
+        resultados.append(resultado)
+        print(f"{descricao}: mediana {resultado['tempo_mediana']:.4f}s, p95 {resultado['tempo_p95']:.4f}s, "
+              f"{resultado['vazao']:.0f} números/s, pico {resultado['pico_rss_mb']:.1f} MB")
+
+    salvar_resultados(resultados, args.saida)
+    print(f"Resultados salvos em: {args.saida}.csv e {args.saida}.json")
+    if args.instrumentacao:
+        print(f"Resumos da instrumentação em: {args.instrumentacao}")
+
+if __name__ == "__main__":
+    main()
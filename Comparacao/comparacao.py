@@ -1,20 +1,35 @@
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 
-# Ler os arquivos CSV
-df1 = pd.read_csv('sequencial.csv')
-df2 = pd.read_csv('paralelo.csv')
-df3 = pd.read_csv('distribuido.csv')
+# Resultados do benchmark.py, se existirem; senão, os CSVs de cada abordagem
+ARQUIVO_BENCHMARK = 'resultados_benchmark.csv'
 
-# Plotar as três retas
-plt.plot(df1['intervalo'], df1['tempo_execucao'], 
-         marker='o', label='Método Sequencial', linewidth=2)
+if os.path.exists(ARQUIVO_BENCHMARK):
+    df = pd.read_csv(ARQUIVO_BENCHMARK)
 
-plt.plot(df2['intervalo'], df2['tempo_execucao'], 
-         marker='s', label='Método Paralelo', linewidth=2)
+    # Uma reta por combinação de modo, engine e workers: mediana das repetições,
+    # com barras do menor tempo ao p95
+    for (modo, engine, workers), grupo in df.groupby(['modo', 'engine', 'workers']):
+        grupo = grupo.sort_values('fim')
+        plt.errorbar(grupo['intervalo'], grupo['tempo_mediana'],
+                     yerr=[grupo['tempo_mediana'] - grupo['tempo_minimo'], grupo['tempo_p95'] - grupo['tempo_mediana']],
+                     marker='o', capsize=3, label=f'{modo} ({engine}, {workers} workers)', linewidth=2)
+else:
+    # Ler os arquivos CSV
+    df1 = pd.read_csv('sequencial.csv')
+    df2 = pd.read_csv('paralelo.csv')
+    df3 = pd.read_csv('distribuido.csv')
 
-plt.plot(df3['intervalo'], df3['tempo_execucao'], 
-         marker='^', label='Método Distribuído', linewidth=2)
+    # Plotar as três retas
+    plt.plot(df1['intervalo'], df1['tempo_execucao'],
+             marker='o', label='Método Sequencial', linewidth=2)
+
+    plt.plot(df2['intervalo'], df2['tempo_execucao'],
+             marker='s', label='Método Paralelo', linewidth=2)
+
+    plt.plot(df3['intervalo'], df3['tempo_execucao'],
+             marker='^', label='Método Distribuído', linewidth=2)
 
 plt.xlabel('Intervalo', fontsize=12)
 plt.ylabel('Tempo (s)', fontsize=12)
@@ -25,4 +40,4 @@ plt.tight_layout()
 
 plt.savefig('Comparação.png', dpi=300, bbox_inches='tight')
 
-plt.show()
\ No newline at end of file
+plt.show()
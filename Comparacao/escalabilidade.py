@@ -0,0 +1,179 @@
+import argparse
+import csv
+import json
+import os
+from benchmark import ENGINE_DISTRIBUIDO, PORTA_PADRAO, executar_em_processo
+
+try:
+    import matplotlib.pyplot as plt
+except ImportError:  # Sem matplotlib, só o CSV/JSON é gerado
+    plt = None
+
+# Estudo de escalabilidade da busca de pares amigáveis: varre a quantidade de
+# workers (threads/processos do Paralelo, clientes do Distribuído) com o
+# problema de tamanho fixo (escalabilidade forte) e com o tamanho proporcional
+# aos workers (escalabilidade fraca). Cada ponto é medido pelo benchmark.py, em
+# um processo novo, e as métricas são relativas ao menor número de workers:
+# - speedup S(p) = T(p0) / T(p) (forte) ou (p / p0) * T(p0) / T(p) (fraca,
+#   speedup escalado: p / p0 vezes mais trabalho no mesmo tempo seria o ideal);
+# - eficiência E(p) = S(p) / (p / p0);
+# - fração serial de Karp–Flatt e(p) = (1/S - 1/(p/p0)) / (1 - 1/(p/p0)), que
+#   fica constante quando a perda vem da parte serial e cresce com p quando
+#   vem de sobrecarga de paralelização.
+#
+# No executor 'threads' com engine de tabela ('crivo', 'numpy', ...), a tabela
+# de somas é montada em série na thread principal e as threads só consultam; os
+# pontos desse modo saem marcados com trabalho_serial e sem fração serial, que
+# não teria significado.
+
+# Modos medidos: encontrar_pares_amigaveis_paralelo com cada executor e
+# executar_distribuicao com clientes locais.
+MODOS_ESCALABILIDADE = ('threads', 'processos', 'memoria_compartilhada', 'distribuido')
+
+WORKERS_PADRAO = [1, 2, 4, 8]
+TAMANHO_FORTE_PADRAO = 1000000
+TAMANHO_POR_WORKER_PADRAO = 250000
+ARQUIVO_SAIDA_PADRAO = 'escalabilidade'
+
+COLUNAS_CSV = ['estudo', 'modo', 'engine', 'workers', 'fim', 'tempo_mediana', 'tempo_p95', 'tempo_desvio',
+               'trabalho_serial', 'speedup', 'eficiencia', 'fracao_serial']
+
+# Modos em que o trabalho principal não é dividido entre os workers.
+def trabalho_serial(modo, engine):
+    return modo == 'threads' and engine != 'divisao'
+
+
+# Acrescenta speedup, eficiência e fração serial aos pontos de um modo,
+# ordenados por workers; o primeiro ponto é a referência.
+def calcular_metricas(pontos, estudo):
+    referencia = pontos[0]
+    for ponto in pontos:
+        razao_workers = ponto['workers'] / referencia['workers']
+        speedup = referencia['tempo_mediana'] / ponto['tempo_mediana']
+        if estudo == 'fraca':
+            speedup *= razao_workers
+        ponto['speedup'] = speedup
+        ponto['eficiencia'] = speedup / razao_workers
+        ponto['fracao_serial'] = ((1 / speedup - 1 / razao_workers) / (1 - 1 / razao_workers)
+                                  if razao_workers > 1 and not ponto['trabalho_serial'] else None)
+    return pontos
+
+def executar_estudo(estudo, modos, workers, tamanho, engine, repeticoes, aquecimento, porta):
+    resultados = []
+    for modo in modos:
+        pontos = []
+        for p in sorted(workers):
+            fim = tamanho if estudo == 'forte' else tamanho * p
+            config = {
+                'modo': modo,
+                'engine': ENGINE_DISTRIBUIDO if modo == 'distribuido' else engine,
+                'workers': p,
+                'inicio': 1,
+                'fim': fim,
+                'repeticoes': repeticoes,
+                'aquecimento': aquecimento,
+                'porta': porta,
+                'alvo': 'pares',
+            }
+            try:
+                resultado = executar_em_processo(config)
+            except RuntimeError as erro:
+                print(f"{estudo} {modo} workers={p} 1-{fim}: falhou ({erro})")
+                continue
+            pontos.append({'estudo': estudo, **resultado,
+                           'trabalho_serial': trabalho_serial(modo, resultado['engine'])})
+            print(f"{estudo} {modo} workers={p} 1-{fim}: mediana {resultado['tempo_mediana']:.4f}s")
+
+        if pontos and pontos[0]['trabalho_serial']:
+            print(f"{estudo} {modo}: a tabela da engine {engine} é montada em série; "
+                  f"pontos marcados como trabalho_serial, sem fração serial")
+        if pontos:
+            resultados.extend(calcular_metricas(pontos, estudo))
+    return resultados
+
+# Um arquivo por estudo: speedup (com a reta ideal), eficiência e fração serial.
+def plotar_estudo(resultados, estudo, saida):
+    pontos_estudo = [ponto for ponto in resultados if ponto['estudo'] == estudo]
+    if not pontos_estudo:
+        return
+
+    figura, (eixo_speedup, eixo_eficiencia, eixo_fracao) = plt.subplots(1, 3, figsize=(15, 4.5))
+    for modo in MODOS_ESCALABILIDADE:
+        pontos = [ponto for ponto in pontos_estudo if ponto['modo'] == modo]
+        if not pontos:
+            continue
+        workers = [ponto['workers'] for ponto in pontos]
+        rotulo_modo = f'{modo} (tabela serial)' if pontos[0]['trabalho_serial'] else modo
+        eixo_speedup.plot(workers, [ponto['speedup'] for ponto in pontos], marker='o', label=rotulo_modo, linewidth=2)
+        eixo_eficiencia.plot(workers, [ponto['eficiencia'] for ponto in pontos], marker='o', label=rotulo_modo,
+                             linewidth=2)
+        com_fracao = [ponto for ponto in pontos if ponto['fracao_serial'] is not None]
+        eixo_fracao.plot([ponto['workers'] for ponto in com_fracao], [ponto['fracao_serial'] for ponto in com_fracao],
+                         marker='o', label=modo, linewidth=2)
+
+    workers = sorted({ponto['workers'] for ponto in pontos_estudo})
+    eixo_speedup.plot(workers, [p / workers[0] for p in workers], linestyle='--', color='gray', label='ideal')
+    eixo_eficiencia.axhline(1.0, linestyle='--', color='gray')
+
+    titulo = 'forte (tamanho fixo)' if estudo == 'forte' else 'fraca (tamanho proporcional)'
+    for eixo, rotulo in ((eixo_speedup, 'Speedup'), (eixo_eficiencia, 'Eficiência'),
+                         (eixo_fracao, 'Fração serial (Karp–Flatt)')):
+        eixo.set_xlabel('Workers', fontsize=12)
+        eixo.set_ylabel(rotulo, fontsize=12)
+        eixo.set_xscale('log', base=2)
+        eixo.set_xticks(workers, [str(p) for p in workers])
+        eixo.grid(True, alpha=0.3)
+        eixo.legend(fontsize=9)
+    figura.suptitle(f'Escalabilidade {titulo}', fontsize=13)
+
+    figura.tight_layout()
+    figura.savefig(f'{saida}_{estudo}.png', dpi=300, bbox_inches='tight')
+    plt.close(figura)
+
+def salvar_resultados(resultados, saida):
+    with open(saida + '.csv', 'w', newline='', encoding='utf-8') as arquivo:
+        writer = csv.DictWriter(arquivo, fieldnames=COLUNAS_CSV, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(resultados)
+    with open(saida + '.json', 'w', encoding='utf-8') as arquivo:
+        json.dump(resultados, arquivo, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Estudo de escalabilidade forte e fraca da busca de pares amigáveis")
+    parser.add_argument('--estudos', nargs='+', choices=('forte', 'fraca'), default=['forte', 'fraca'])
+    parser.add_argument('--modos', nargs='+', choices=MODOS_ESCALABILIDADE, default=['processos', 'distribuido'])
+    parser.add_argument('--workers', nargs='+', type=int, default=WORKERS_PADRAO)
+    parser.add_argument('--tamanho', type=int, default=TAMANHO_FORTE_PADRAO,
+                        help="fim do intervalo na escalabilidade forte")
+    parser.add_argument('--tamanho-por-worker', type=int, default=TAMANHO_POR_WORKER_PADRAO,
+                        help="números por worker na escalabilidade fraca")
+    parser.add_argument('--engine', default='crivo', help="engine dos modos do Paralelo")
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--aquecimento', type=int, default=1)
+    parser.add_argument('--porta', type=int, default=PORTA_PADRAO)
+    parser.add_argument('--saida', default=ARQUIVO_SAIDA_PADRAO,
+                        help="prefixo dos arquivos de saída (.csv, .json e _forte/_fraca.png)")
+    args = parser.parse_args()
+
+    if os.cpu_count() and max(args.workers) > os.cpu_count():
+        print(f"Aviso: mais workers ({max(args.workers)}) que núcleos ({os.cpu_count()}); "
+              f"os pontos acima disso medem sobrecarga, não escalabilidade.")
+
+    resultados = []
+    for estudo in args.estudos:
+        tamanho = args.tamanho if estudo == 'forte' else args.tamanho_por_worker
+        resultados.extend(executar_estudo(estudo, args.modos, args.workers, tamanho, args.engine,
+                                          args.repeticoes, args.aquecimento, args.porta))
+
+    salvar_resultados(resultados, args.saida)
+    print(f"Resultados salvos em: {args.saida}.csv e {args.saida}.json")
+
+    if plt is None:
+        print("matplotlib não está instalado: gráficos não gerados.")
+        return
+    for estudo in args.estudos:
+        plotar_estudo(resultados, estudo, args.saida)
+    print(f"Gráficos salvos em: {args.saida}_<estudo>.png")
+
+if __name__ == "__main__":
+    main()
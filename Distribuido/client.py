@@ -1,27 +1,158 @@
+import argparse
+import math
+import os
 import socket
-import pickle
-from perfect_or_friendly_seq import analisar_intervalo # Carregar lógica de solução da abordagem sequencial
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from instrumentacao import medir, registrar
+from perfect_or_friendly_seq import analisar_janela_segmentada, iter_segmentos # Carregar lógica de solução da abordagem sequencial
+from protocolo import (INTERVALO, PARCIAL, FIM, REGISTRO, HEARTBEAT, ENCERRAR, PEDIDO, enviar_mensagem,
+                       receber_mensagem, decodificar_intervalo, codificar_parcial, codificar_fim,
+                       codificar_registro)
 
 # Definição de host do servidor como "localhost:12345"
 HOST = 'localhost'
 PORT = 12345
 
+# Quantidade máxima de números por subfaixa; o resultado de cada subfaixa é enviado assim que fica pronto.
+TAMANHO_SUBFAIXA = 100000
+
+# Com vários processos locais, a faixa é dividida em pelo menos CHUNKS_POR_WORKER
+# subfaixas por processo, como em Paralelo/perfect_or_friendly_paralelo.py.
+CHUNKS_POR_WORKER = 4
+
+# Intervalo (em segundos) entre os heartbeats enviados ao servidor.
+INTERVALO_HEARTBEAT = 2.0
+
+# Faixas pedidas além da atual, para que a próxima já esteja na fila quando a
+# atual terminar (o servidor limita quantas ficam em andamento por cliente).
+FAIXAS_ANTECIPADAS = 1
+
+# Envia heartbeats periódicos até o evento de parada ser sinalizado.
+def enviar_heartbeats(s, lock_envio, parar):
+    while not parar.wait(INTERVALO_HEARTBEAT):
+        try:
+            with lock_envio:
+                enviar_mensagem(s, HEARTBEAT)
+        except OSError:
+            return
+
+# Divide a faixa recebida em subfaixas contíguas. No crivo segmentado o custo por
+# número é praticamente uniforme, então basta dividir em partes de mesmo tamanho.
+def dividir_em_subfaixas(inicio, fim, num_workers):
+    tamanho = fim - inicio + 1
+    if num_workers > 1:
+        tamanho_subfaixa = min(TAMANHO_SUBFAIXA, math.ceil(tamanho / (num_workers * CHUNKS_POR_WORKER)))
+    else:
+        tamanho_subfaixa = TAMANHO_SUBFAIXA
+    return [(sub_inicio, min(sub_inicio + tamanho_subfaixa - 1, fim))
+            for sub_inicio in range(inicio, fim + 1, tamanho_subfaixa)]
+
+# Tarefa de um processo do pool local: analisa uma subfaixa e devolve também
+# as ligações pendentes (para o servidor estender o intervalo depois), o pid do
+# processo e o tempo gasto, para a contabilidade por núcleo.
+def processar_subfaixa(inicio, fim, limite_parceiros, pares_abaixo_de=None):
+    tempo_inicio = time.perf_counter()
+    pendentes = []
+    perfeitos, pares = analisar_janela_segmentada(inicio, fim, limite_parceiros, pendentes=pendentes,
+                                                  pares_abaixo_de=pares_abaixo_de)
+    return inicio, fim, perfeitos, pares, pendentes, os.getpid(), time.perf_counter() - tempo_inicio
+
+# Sem pool, a faixa é percorrida por um único gerador do crivo segmentado (os
+# primos são gerados uma vez por faixa) e cada segmento é entregue assim que
+# fica pronto, no mesmo formato de processar_subfaixa.
+def iter_resultados_locais(inicio, fim, limite_parceiros, pares_abaixo_de=None):
+    pid = os.getpid()
+    tempo_inicio = time.perf_counter()
+    for sub_inicio, sub_fim, perfeitos, pares, pendentes in iter_segmentos(
+            inicio, fim, limite_parceiros, TAMANHO_SUBFAIXA, coletar_pendentes=True,
+            pares_abaixo_de=pares_abaixo_de):
+        tempo_fim = time.perf_counter()
+        yield sub_inicio, sub_fim, perfeitos, pares, pendentes, pid, tempo_fim - tempo_inicio
+        tempo_inicio = time.perf_counter()
+
+# Processa uma tarefa recebida do servidor, enviando o resultado de cada subfaixa.
+# Com pool, as subfaixas rodam nos processos locais e são enviadas na ordem em que terminam.
+def processar_tarefa(s, lock_envio, corpo, pool=None, num_workers=1):
+    # O limite_parceiros é o fim global do intervalo, usado para os parceiros
+    # dos pares amigáveis que caem fora da faixa deste cliente; pares_abaixo_de
+    # é o início global, abaixo do qual os pares são confirmados pelo maior elemento.
+    id_tarefa, inicio, fim, limite_parceiros, pares_abaixo_de = decodificar_intervalo(corpo)
+    print(f"Intervalo recebido: {(inicio, fim)}")
+
+    tempo_inicio = time.time()
+
+    # Processa a faixa em subfaixas (crivo segmentado, sem recalcular a partir de 1)
+    # e envia os resultados parciais de cada uma ao servidor.
+    if pool is None:
+        resultados = iter_resultados_locais(inicio, fim, limite_parceiros, pares_abaixo_de)
+    else:
+        futuros = [pool.submit(processar_subfaixa, sub_inicio, sub_fim, limite_parceiros, pares_abaixo_de)
+                   for sub_inicio, sub_fim in dividir_em_subfaixas(inicio, fim, num_workers)]
+        resultados = (futuro.result() for futuro in as_completed(futuros))
+
+    tempos_nucleos = defaultdict(float) # pid -> tempo ocupado nesta tarefa
+    for sub_inicio, sub_fim, perfeitos, pares, pendentes, pid, tempo_subfaixa in resultados:
+        tempos_nucleos[pid] += tempo_subfaixa
+        # O cálculo pode ter rodado em outro processo do pool: o span vem pronto.
+        registrar('cliente.calculo', tempo_subfaixa)
+        with medir('cliente.envio'), lock_envio:
+            enviar_mensagem(s, PARCIAL, codificar_parcial(id_tarefa, sub_inicio, sub_fim, perfeitos, pares, pendentes))
+
+    # Sinaliza o fim da tarefa com o tempo de processamento local e o de cada núcleo
+    # (ordenados por pid, estáveis entre tarefas já que o pool é persistente).
+    tempos_ordenados = [tempos_nucleos[pid] for pid in sorted(tempos_nucleos)]
+    with lock_envio:
+        enviar_mensagem(s, FIM, codificar_fim(id_tarefa, time.time() - tempo_inicio, tempos_ordenados))
+
 def main():
+    parser = argparse.ArgumentParser(description="Cliente da busca distribuída de números perfeitos e amigáveis")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processos locais usados em cada faixa (0 = todos os núcleos)")
+    parser.add_argument('--host', default=HOST, help="endereço do servidor")
+    parser.add_argument('--port', type=int, default=PORT, help="porta do servidor")
+    args = parser.parse_args()
+    num_workers = args.workers or os.cpu_count() or 1
+
+    # Pool local persistente, reutilizado por todas as faixas recebidas.
+    pool = ProcessPoolExecutor(max_workers=num_workers) if num_workers > 1 else None
+
     # Criação de socket client-side
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
 
-        # Leitura dos intervalos distribuídos pelo servidor.
-        s.connect((HOST, PORT)) # Conexão ao servidor
-        data = s.recv(1024) # Leitura dos dados da comunicação TCP (tamanho máximo de 1024bytes)
-        intervalo = pickle.loads(data) # Recebe a array dos intervalos (ex: [1, 10000])
+        # Conexão e registro únicos: a mesma conexão atende a todas as tarefas.
+        s.connect((args.host, args.port)) # Conexão ao servidor
+        enviar_mensagem(s, REGISTRO, codificar_registro(num_workers))
 
-        print(f"Intervalo recebido: {intervalo}")
+        # O heartbeat roda em paralelo ao processamento; o lock evita que as
+        # mensagens das duas threads se misturem no socket.
+        lock_envio = threading.Lock()
+        parar = threading.Event()
+        threading.Thread(target=enviar_heartbeats, args=(s, lock_envio, parar), daemon=True).start()
 
-        # Chamada da função "analisar_intervalo()" da abordagem sequencial.
-        resultado = analisar_intervalo(intervalo[0], intervalo[1])
-        
-        # Envia os resultados para o servidor via pickle.
-        s.sendall(pickle.dumps(resultado))
+        try:
+            # Pede uma faixa sempre que termina outra, até o servidor encerrar a sessão.
+            with lock_envio:
+                for _ in range(1 + FAIXAS_ANTECIPADAS):
+                    enviar_mensagem(s, PEDIDO)
+            while True:
+                # Tempo ocioso do cliente, à espera da próxima faixa
+                with medir('cliente.espera_tarefa'):
+                    tipo, corpo = receber_mensagem(s)
+                if tipo == ENCERRAR:
+                    print("Servidor encerrou a sessão.")
+                    break
+                if tipo != INTERVALO:
+                    raise ConnectionError(f"Mensagem inesperada do servidor: tipo {tipo}")
+                processar_tarefa(s, lock_envio, corpo, pool, num_workers)
+                with lock_envio:
+                    enviar_mensagem(s, PEDIDO)
+        finally:
+            parar.set()
+            if pool is not None:
+                pool.shutdown()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,131 @@
+import math
+import random
+from typing import Dict, List
+
+# Fatoração de inteiros arbitrários (inclusive maiores que 64 bits) para obter
+# sigma(n) a partir dos fatores primos: sigma(p1^k1 * ... * pr^kr) é o produto
+# das somas 1 + p + ... + p^k. Os fatores pequenos saem por divisão pela tabela
+# de primos compartilhada; o cofator que sobra, se composto, é quebrado pelo
+# rho de Pollard–Brent até restarem só primos (confirmados por Miller–Rabin).
+
+# Primos usados na divisão por tentativa; um cofator menor que o quadrado do
+# limite que sobra depois dela é primo.
+LIMITE_PRIMOS_PEQUENOS = 1 << 10
+
+# Bases do teste de Miller–Rabin. Com elas o teste é determinístico para
+# n < 3.317·10^24 (o que cobre todos os inteiros de 64 bits); acima disso a
+# chance de um composto passar é no máximo 4^-13.
+BASES_MILLER_RABIN = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+def gerar_primos_pequenos(limite: int) -> List[int]:
+    crivo = bytearray([1]) * (limite + 1)
+    crivo[0] = crivo[1] = 0
+    for i in range(2, math.isqrt(limite) + 1):
+        if crivo[i]:
+            crivo[i * i::i] = bytes(len(range(i * i, limite + 1, i)))
+    return [i for i in range(limite + 1) if crivo[i]]
+
+# Tabela compartilhada por todas as fatorações do processo.
+PRIMOS_PEQUENOS = gerar_primos_pequenos(LIMITE_PRIMOS_PEQUENOS)
+
+def eh_primo(n: int) -> bool:
+    if n < 2:
+        return False
+    for p in BASES_MILLER_RABIN:
+        if n % p == 0:
+            return n == p
+
+    # n - 1 = d * 2^s com d ímpar
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in BASES_MILLER_RABIN:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False # a é testemunha de que n é composto
+    return True
+
+# Produtos de |x - y| acumulados antes de cada mdc no rho de Pollard–Brent.
+TAMANHO_BLOCO_RHO = 128
+
+# Devolve um fator não trivial de n, que deve ser composto, ímpar e sem fatores
+# na tabela de primos pequenos. Variante de Brent do rho de Pollard: a sequência
+# x -> x² + c (mod n) é comparada com um ponto fixo y que avança em potências de
+# 2 (uma avaliação de f por passo, contra três no ciclo de Floyd), e as
+# diferenças são multiplicadas em blocos para fazer um único mdc por bloco. Se
+# o bloco pular o fator, ele é refeito passo a passo; se o ciclo fecha sem
+# fator, tenta outro c.
+def pollard_rho(n: int) -> int:
+    while True:
+        c = random.randrange(1, n)
+        y = random.randrange(2, n)
+        tamanho_ciclo = 1
+        produto = 1
+        d = 1
+        while d == 1:
+            x = y
+            for _ in range(tamanho_ciclo):
+                y = (y * y + c) % n
+            passos = 0
+            while passos < tamanho_ciclo and d == 1:
+                y_bloco = y
+                for _ in range(min(TAMANHO_BLOCO_RHO, tamanho_ciclo - passos)):
+                    y = (y * y + c) % n
+                    produto = produto * abs(x - y) % n
+                d = math.gcd(produto, n)
+                passos += TAMANHO_BLOCO_RHO
+            tamanho_ciclo *= 2
+
+        if d == n:
+            # O bloco passou do fator: refaz do início do bloco, um mdc por passo
+            d = 1
+            while d == 1:
+                y_bloco = (y_bloco * y_bloco + c) % n
+                d = math.gcd(abs(x - y_bloco), n)
+        if d != n:
+            return d
+
+# Fatores primos de n >= 1 como {primo: expoente}.
+def fatorar(n: int) -> Dict[int, int]:
+    fatores = {}
+    for p in PRIMOS_PEQUENOS:
+        if p * p > n:
+            break
+        if n % p == 0:
+            k = 0
+            while n % p == 0:
+                n //= p
+                k += 1
+            fatores[p] = k
+
+    # O cofator não tem fatores até LIMITE_PRIMOS_PEQUENOS
+    pendentes = [n] if n > 1 else []
+    while pendentes:
+        m = pendentes.pop()
+        if m < LIMITE_PRIMOS_PEQUENOS * LIMITE_PRIMOS_PEQUENOS or eh_primo(m):
+            fatores[m] = fatores.get(m, 0) + 1
+        else:
+            d = pollard_rho(m)
+            pendentes.extend((d, m // d))
+    return fatores
+
+def sigma_fatores(fatores: Dict[int, int]) -> int:
+    sigma = 1
+    for p, k in fatores.items():
+        sigma *= (p ** (k + 1) - 1) // (p - 1)
+    return sigma
+
+# Soma dos divisores próprios de n, pela fatoração.
+def soma_divisores_fatoracao(n: int) -> int:
+    if n <= 1:
+        return 0
+    return sigma_fatores(fatorar(n)) - n
@@ -0,0 +1,126 @@
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, List
+
+# Instrumentação dos trechos quentes: spans (tempo de cada fase, via context
+# manager) e contadores (chamadas, acertos de cache, bytes na rede, ...).
+# Desligada, medir() devolve sempre o mesmo context manager vazio e contar()
+# retorna na primeira linha, então o custo é só o de uma chamada de função.
+#
+# Todas as abordagens usam o mesmo coletor, e o resumo de cada processo pode ser
+# acrescentado (uma linha JSON por processo) a um arquivo comum. Processos
+# filhos herdam a variável de ambiente VARIAVEL_AMBIENTE: se ela tiver um
+# caminho, a instrumentação liga ao importar o módulo e o resumo do processo é
+# gravado ao sair. Processos de pool encerrados pelo multiprocessing não
+# executam o atexit; o tempo deles aparece nos spans de espera do processo pai.
+VARIAVEL_AMBIENTE = 'INSTRUMENTACAO'
+
+ativo = False
+destino = None # Arquivo comum dos resumos (None = só em memória).
+lock = threading.Lock()
+spans = {} # nome -> [quantidade, tempo total, maior tempo]
+contadores = {} # nome -> valor
+
+SEM_MEDICAO = nullcontext()
+
+class Span:
+    __slots__ = ('nome', 'inicio')
+
+    def __init__(self, nome: str):
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        registrar(self.nome, time.perf_counter() - self.inicio)
+
+# Mede o bloco `with medir(nome):` como um span.
+def medir(nome: str):
+    if not ativo:
+        return SEM_MEDICAO
+    return Span(nome)
+
+# Registra a duração de um span medido por fora (por exemplo, em outro processo).
+def registrar(nome: str, duracao: float):
+    if not ativo:
+        return
+    with lock:
+        span = spans.get(nome)
+        if span is None:
+            spans[nome] = [1, duracao, duracao]
+        else:
+            span[0] += 1
+            span[1] += duracao
+            if duracao > span[2]:
+                span[2] = duracao
+
+def contar(nome: str, quantidade: int = 1):
+    if not ativo:
+        return
+    with lock:
+        contadores[nome] = contadores.get(nome, 0) + quantidade
+
+def ativar(caminho: str = None):
+    global ativo, destino
+    destino = caminho
+    ativo = True
+
+def desativar():
+    global ativo
+    ativo = False
+
+def zerar():
+    with lock:
+        spans.clear()
+        contadores.clear()
+
+def resumo() -> Dict:
+    with lock:
+        return {
+            'pid': os.getpid(),
+            'processo': os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else 'python',
+            'spans': {nome: {'quantidade': quantidade, 'total': total, 'maximo': maximo,
+                             'media': total / quantidade}
+                      for nome, (quantidade, total, maximo) in sorted(spans.items())},
+            'contadores': dict(sorted(contadores.items())),
+        }
+
+# Acrescenta o resumo deste processo ao arquivo comum e zera o coletor.
+def descarregar():
+    if destino is None or not (spans or contadores):
+        return
+    linha = json.dumps(resumo())
+    with open(destino, 'a', encoding='utf-8') as arquivo:
+        arquivo.write(linha + '\n')
+    zerar()
+
+def ler_resumos(caminho: str) -> List[Dict]:
+    with open(caminho, encoding='utf-8') as arquivo:
+        return [json.loads(linha) for linha in arquivo if linha.strip()]
+
+# Soma os resumos de vários processos em um só (spans e contadores por nome).
+def agregar(resumos: List[Dict]) -> Dict:
+    spans_agregados = {}
+    contadores_agregados = {}
+    for item in resumos:
+        for nome, span in item['spans'].items():
+            agregado = spans_agregados.setdefault(nome, {'quantidade': 0, 'total': 0.0, 'maximo': 0.0})
+            agregado['quantidade'] += span['quantidade']
+            agregado['total'] += span['total']
+            agregado['maximo'] = max(agregado['maximo'], span['maximo'])
+        for nome, valor in item['contadores'].items():
+            contadores_agregados[nome] = contadores_agregados.get(nome, 0) + valor
+    for agregado in spans_agregados.values():
+        agregado['media'] = agregado['total'] / agregado['quantidade']
+    return {'processos': len(resumos), 'spans': spans_agregados, 'contadores': contadores_agregados}
+
+if os.environ.get(VARIAVEL_AMBIENTE):
+    ativar(os.environ[VARIAVEL_AMBIENTE])
+    atexit.register(descarregar)
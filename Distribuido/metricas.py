@@ -0,0 +1,118 @@
+import asyncio
+import math
+import time
+
+# Métricas do coordenador no formato de texto do Prometheus, servidas por HTTP
+# (qualquer caminho, por exemplo http://localhost:12346/metrics) enquanto o
+# coordenador estiver no ar. O progresso vem dos resultados parciais que os
+# clientes enviam a cada subfaixa concluída, então os números avançam em
+# passos de até TAMANHO_SUBFAIXA (client.py) por cliente.
+TIPO_CONTEUDO = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Tempo máximo (em segundos) para ler a requisição de quem consulta as métricas.
+TIMEOUT_REQUISICAO = 5.0
+
+# Nome, tipo e descrição de cada métrica exportada.
+METRICAS_GERAIS = (
+    ('distribuicao_trabalhadores', 'gauge', "Clientes registrados no pool"),
+    ('distribuicao_nucleos', 'gauge', "Núcleos somados dos clientes registrados"),
+    ('distribuicao_em_andamento', 'gauge', "1 enquanto há um intervalo sendo distribuído"),
+    ('distribuicao_numeros_total', 'gauge', "Números a processar no intervalo atual"),
+    ('distribuicao_numeros_processados', 'gauge', "Números do intervalo atual já processados"),
+    ('distribuicao_faixas_em_andamento', 'gauge', "Leases entregues e ainda não concluídos"),
+    ('distribuicao_faixas_reenviadas', 'gauge', "Faixas do intervalo atual redistribuídas após falha ou timeout"),
+    ('distribuicao_vazao_numeros_por_segundo', 'gauge', "Vazão do intervalo atual desde o início"),
+    ('distribuicao_eta_segundos', 'gauge', "Tempo estimado até o fim do intervalo atual"),
+)
+METRICAS_TRABALHADOR = (
+    ('distribuicao_trabalhador_nucleos', 'gauge', "Núcleos do cliente"),
+    ('distribuicao_trabalhador_numeros_processados_total', 'counter', "Números processados pelo cliente"),
+    ('distribuicao_trabalhador_faixas_concluidas_total', 'counter', "Faixas concluídas pelo cliente"),
+    ('distribuicao_trabalhador_faixas_em_andamento', 'gauge', "Leases em andamento no cliente"),
+    ('distribuicao_trabalhador_vazao_numeros_por_segundo', 'gauge', "Vazão medida nas faixas concluídas"),
+    ('distribuicao_trabalhador_eta_segundos', 'gauge', "Tempo estimado para concluir os leases do cliente"),
+    ('distribuicao_trabalhador_segundos_desde_contato', 'gauge', "Segundos desde a última mensagem do cliente"),
+)
+
+def formatar_valor(valor) -> str:
+    if valor is None or (isinstance(valor, float) and math.isnan(valor)):
+        return 'NaN'
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+def rotulo_cliente(addr) -> str:
+    if isinstance(addr, tuple):
+        return f'{addr[0]}:{addr[1]}'
+    return str(addr)
+
+# Valores gerais e por cliente, lidos do estado do coordenador no event loop.
+def coletar_metricas(coordenador):
+    agora = time.time()
+    trabalho = coordenador.trabalho
+    gerais = {
+        'distribuicao_trabalhadores': len(coordenador.trabalhadores),
+        'distribuicao_nucleos': sum(t.nucleos for t in coordenador.trabalhadores),
+        'distribuicao_em_andamento': int(trabalho is not None),
+        'distribuicao_faixas_em_andamento': len(coordenador.faixas),
+    }
+    if trabalho is not None:
+        decorrido = agora - trabalho.iniciado_em
+        vazao = trabalho.numeros_processados / decorrido if decorrido > 0 else 0.0
+        restante = trabalho.numeros_total - trabalho.numeros_processados
+        gerais.update({
+            'distribuicao_numeros_total': trabalho.numeros_total,
+            'distribuicao_numeros_processados': trabalho.numeros_processados,
+            'distribuicao_faixas_reenviadas': trabalho.faixas_reenviadas,
+            'distribuicao_vazao_numeros_por_segundo': vazao,
+            'distribuicao_eta_segundos': restante / vazao if vazao > 0 else None,
+        })
+
+    por_trabalhador = []
+    for trabalhador in coordenador.trabalhadores:
+        # Números que faltam nos leases deste cliente, pela vazão medida dele
+        restante = sum(faixa['fim'] - faixa['inicio'] + 1 - faixa['processados']
+                       for faixa in (coordenador.faixas.get(i) for i in trabalhador.faixas) if faixa is not None)
+        por_trabalhador.append((rotulo_cliente(trabalhador.addr), {
+            'distribuicao_trabalhador_nucleos': trabalhador.nucleos,
+            'distribuicao_trabalhador_numeros_processados_total': trabalhador.numeros_processados,
+            'distribuicao_trabalhador_faixas_concluidas_total': trabalhador.faixas_concluidas,
+            'distribuicao_trabalhador_faixas_em_andamento': len(trabalhador.faixas),
+            'distribuicao_trabalhador_vazao_numeros_por_segundo': trabalhador.vazao,
+            'distribuicao_trabalhador_eta_segundos': (restante / trabalhador.vazao if trabalhador.vazao
+                                                      else (0 if restante == 0 else None)),
+            'distribuicao_trabalhador_segundos_desde_contato': agora - trabalhador.ultimo_contato,
+        }))
+    return gerais, por_trabalhador
+
+def formatar_metricas(coordenador) -> str:
+    gerais, por_trabalhador = coletar_metricas(coordenador)
+    linhas = []
+    for nome, tipo, descricao in METRICAS_GERAIS:
+        if nome not in gerais:
+            continue
+        linhas.append(f'# HELP {nome} {descricao}')
+        linhas.append(f'# TYPE {nome} {tipo}')
+        linhas.append(f'{nome} {formatar_valor(gerais[nome])}')
+    for nome, tipo, descricao in METRICAS_TRABALHADOR:
+        if not por_trabalhador:
+            break
+        linhas.append(f'# HELP {nome} {descricao}')
+        linhas.append(f'# TYPE {nome} {tipo}')
+        for cliente, valores in por_trabalhador:
+            linhas.append(f'{nome}{{cliente="{cliente}"}} {formatar_valor(valores[nome])}')
+    return '\n'.join(linhas) + '\n'
+
+# Atende uma consulta HTTP: lê a requisição até o fim dos cabeçalhos e responde
+# com as métricas atuais, fechando a conexão em seguida.
+async def atender_consulta(coordenador, reader, writer):
+    try:
+        await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), TIMEOUT_REQUISICAO)
+        corpo = formatar_metricas(coordenador).encode('utf-8')
+        writer.write(b'HTTP/1.1 200 OK\r\n' +
+                     f'Content-Type: {TIPO_CONTEUDO}\r\nContent-Length: {len(corpo)}\r\n'
+                     f'Connection: close\r\n\r\n'.encode('ascii') + corpo)
+        await writer.drain()
+    except (OSError, ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+            asyncio.TimeoutError):
+        pass
+    finally:
+        writer.close()
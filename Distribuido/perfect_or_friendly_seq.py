@@ -1,28 +1,601 @@
 import math
-from typing import List, Tuple, Set, Dict
+import time
+from typing import List, Tuple, Set, Dict, Iterator, Optional
 from collections import defaultdict
+from armazenamento_somas import ArmazenamentoSomas
+from fatoracao import soma_divisores_fatoracao, eh_primo
+from cache_somas import CacheSomas, LIMITE_DENSO_PADRAO, CAPACIDADE_LRU_PADRAO
+from instrumentacao import medir, contar
+
+try:
+    import numpy as np
+except ImportError:  # Backend NumPy é opcional
+    np = None
 
 def calcular_soma_divisores(n: int) -> int:
     """
     Calcula a soma dos divisores próprios de um número de forma otimizada.
     Divisores próprios são todos os divisores exceto o próprio número.
     
-    Complexidade: O(√n)
+    Até LIMITE_DIVISAO_TENTATIVA usa divisão por tentativa, O(√n); acima
+    disso, a fatoração por Miller–Rabin e rho de Pollard–Brent.
     """
+    contar('chamadas_soma_divisores')
+    if cache_somas is not None:
+        soma = cache_somas.obter(n)
+        if soma is not None:
+            return soma
+    if armazenamento is not None:
+        # Consulta o armazenamento persistente, se o número já estiver nele
+        soma = armazenamento.obter(n)
+        if soma is not None:
+            return soma
+    
     if n <= 1:
         return 0
+    if n > LIMITE_DIVISAO_TENTATIVA:
+        # Números grandes: sigma(n) a partir da fatoração, em milissegundos
+        # mesmo para 64 bits ou mais
+        soma = soma_divisores_fatoracao(n)
+    else:
+        soma = 1  # 1 é sempre divisor próprio
+        
+        # Itera apenas até a raiz quadrada
+        for i in range(2, int(math.sqrt(n)) + 1):
+            if n % i == 0:
+                soma += i
+                # Adiciona o divisor correspondente, evitando duplicatas
+                if i != n // i:
+                    soma += n // i
+    
+    if cache_somas is not None:
+        cache_somas.guardar(n, soma)
+    return soma
+
+# Engines disponíveis para o cálculo das somas de divisores:
+# - 'divisao': divisão por tentativa, número a número (O(N·√N))
+# - 'crivo': crivo linear sobre o intervalo inteiro (O(N))
+# - 'numpy': tabela int64 contígua preenchida com somas vetorizadas (requer numpy)
+# - 'segmentado': crivo por segmentos apenas sobre a janela [inicio, fim]
+ENGINES = ('divisao', 'crivo', 'numpy', 'segmentado')
+ENGINE_PADRAO = 'crivo'
+# Tamanho dos blocos usados nas comparações vetorizadas da engine 'numpy'
+BLOCO_NUMPY = 1 << 20
+# Quantidade de números por segmento da engine 'segmentado'
+TAMANHO_SEGMENTO_PADRAO = 1 << 16
+# Primos usados no filtro rápido de parceiros fora do segmento
+LIMITE_PRIMOS_FILTRO = 200
+# Acima deste valor, calcular_soma_divisores troca a divisão por tentativa até √n
+# pela fatoração (Miller–Rabin e rho de Pollard–Brent, ver fatoracao.py)
+LIMITE_DIVISAO_TENTATIVA = 1 << 20
+# Primos do filtro aplicado às ligações pendentes: menos primos que
+# LIMITE_PRIMOS_FILTRO deixam o filtro barato para os muitos números com s(n)
+# além do fim, e a fatoração confirma os poucos que restam
+LIMITE_PRIMOS_FILTRO_PENDENTES = 13
+# Na classificação em lote, os números até este limite usam uma tabela do crivo
+# (de 1 até o maior deles) quando são densos o bastante: ao menos um número
+# distinto a cada FATOR_DENSIDADE_LOTE posições da tabela
+LIMITE_TABELA_LOTE = 1 << 22
+FATOR_DENSIDADE_LOTE = 16
+# Maior comprimento de ciclo alíquota procurado por padrão (o maior ciclo
+# sociável conhecido tem 28 elementos)
+COMPRIMENTO_MAXIMO_CICLO_PADRAO = 30
+
+# Arquivo padrão do armazenamento persistente de somas de divisores, e o
+# armazenamento ativo no processo (None = desativado, ver ativar_armazenamento)
+ARQUIVO_ARMAZENAMENTO_PADRAO = "somas_divisores.bin"
+armazenamento = None
+# Cache das somas de divisores compartilhado pelas chamadas de
+# calcular_soma_divisores e calcular_somas_lote no processo. Desligado por
+# padrão, para que os tempos medidos sejam sempre de cálculo (ver configurar_cache_somas)
+cache_somas = None
+
+# Cache dos expoentes de Mersenne (p com 2^p - 1 primo) já encontrados pelo teste
+# de Lucas–Lehmer, em ordem, e do maior expoente já testado
+expoentes_mersenne = []
+maior_expoente_testado = 1
+
+def validar_engine(engine: str):
+    """
+    Garante que a engine solicitada é conhecida.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Engine desconhecida: {engine!r} (opções: {', '.join(ENGINES)})")
+    if engine == 'numpy' and np is None:
+        raise ImportError("A engine 'numpy' requer o pacote numpy instalado")
+
+def calcular_somas_divisores_crivo(limite: int) -> List[int]:
+    """
+    Calcula a soma dos divisores próprios de todos os números de 0 a limite
+    em uma única passada, usando um crivo linear (menor fator primo).
     
-    soma = 1  # 1 é sempre divisor próprio
+    A soma total de divisores sigma(n) é multiplicativa: se p é o menor fator
+    primo de n e p^k a maior potência de p que divide n, então
+    sigma(n) = sigma(p^k) * sigma(n / p^k). Cada composto é marcado uma única
+    vez, pelo seu menor fator primo.
     
-    # Itera apenas até a raiz quadrada
-    for i in range(2, int(math.sqrt(n)) + 1):
-        if n % i == 0:
-            soma += i
-            # Adiciona o divisor correspondente, evitando duplicatas
-            if i != n // i:
-                soma += n // i
+    Retorna uma lista onde somas[n] = sigma(n) - n (somas[0] = 0).
     
-    return soma
+    Complexidade: O(N)
+    """
+    if limite < 1:
+        return [0] * max(limite + 1, 0)
+    
+    sigma = [0] * (limite + 1)
+    sigma[1] = 1
+    # Potência do menor primo que divide n (p^k) e a soma 1 + p + ... + p^k
+    potencia = [0] * (limite + 1)
+    soma_potencia = [0] * (limite + 1)
+    primos = []
+    
+    for i in range(2, limite + 1):
+        if sigma[i] == 0:
+            # Ainda não marcado: i é primo
+            primos.append(i)
+            sigma[i] = i + 1
+            potencia[i] = i
+            soma_potencia[i] = i + 1
+        
+        sigma_i = sigma[i]
+        for p in primos:
+            ip = i * p
+            if ip > limite:
+                break
+            if i % p == 0:
+                # p já divide i: aumenta a potência do menor fator primo
+                potencia[ip] = potencia[i] * p
+                soma_potencia[ip] = soma_potencia[i] + potencia[ip]
+                sigma[ip] = sigma_i // soma_potencia[i] * soma_potencia[ip]
+                break
+            # p é um novo menor fator primo, coprimo com i
+            potencia[ip] = p
+            soma_potencia[ip] = p + 1
+            sigma[ip] = sigma_i * (p + 1)
+    
+    for n in range(1, limite + 1):
+        sigma[n] -= n
+    
+    return sigma
+
+def calcular_somas_divisores_numpy(limite: int):
+    """
+    Calcula a tabela de somas de divisores próprios de 0 a limite como um
+    array NumPy int64 contíguo (8 bytes por número).
+    
+    Para cada d até √limite, os múltiplos m = d*k com k >= d recebem o par
+    de divisores (d, k) com uma soma vetorizada sobre a fatia somas[d*d::d].
+    O divisor 1 é somado a todos de uma vez e o próprio m (par de 1) é omitido,
+    resultando diretamente em sigma(n) - n.
+    
+    Complexidade: O(N log N) operações vetorizadas em √N chamadas.
+    """
+    somas = np.zeros(max(limite + 1, 0), dtype=np.int64)
+    if limite < 2:
+        return somas
+    
+    somas[2:] = 1
+    for d in range(2, math.isqrt(limite) + 1):
+        # Divisor d em todos os múltiplos a partir de d²
+        somas[d * d::d] += d
+        # Divisor complementar k = m / d, para k > d
+        somas[d * (d + 1)::d] += np.arange(d + 1, limite // d + 1, dtype=np.int64)
+    
+    return somas
+
+def calcular_tabela_somas(limite: int, engine: str = ENGINE_PADRAO):
+    """
+    Calcula a tabela de somas de divisores próprios com a engine indicada:
+    lista de inteiros para 'crivo' ou array int64 para 'numpy'.
+    
+    Com o armazenamento persistente ativo, a tabela é uma visão sem cópia do
+    arquivo mapeado em memória (memoryview, ou array NumPy para 'numpy'), e só
+    os números além do que já está armazenado são calculados.
+    """
+    if armazenamento is not None:
+        return armazenamento.tabela(limite, como_numpy=engine == 'numpy')
+    if engine == 'numpy':
+        return calcular_somas_divisores_numpy(limite)
+    return calcular_somas_divisores_crivo(limite)
+
+def ativar_armazenamento(caminho: str = ARQUIVO_ARMAZENAMENTO_PADRAO) -> ArmazenamentoSomas:
+    """
+    Ativa o armazenamento persistente de somas de divisores no arquivo indicado.
+    A partir daí, calcular_soma_divisores consulta o arquivo e as tabelas
+    (calcular_tabela_somas) crescem nele de forma incremental, de modo que
+    intervalos repetidos ou contidos em outros já calculados não são refeitos.
+    """
+    global armazenamento
+    armazenamento = ArmazenamentoSomas(caminho, calcular_somas_divisores_segmento)
+    return armazenamento
+
+def desativar_armazenamento():
+    """
+    Volta a calcular as somas de divisores sem o armazenamento persistente.
+    """
+    global armazenamento
+    armazenamento = None
+
+def configurar_cache_somas(limite_denso: int = LIMITE_DENSO_PADRAO,
+                           capacidade_lru: int = CAPACIDADE_LRU_PADRAO) -> Optional[CacheSomas]:
+    """
+    Ativa (ou recria) o cache de calcular_soma_divisores e calcular_somas_lote:
+    array denso para n <= limite_denso e LRU com capacidade_lru entradas para
+    os números maiores. Com os dois limites em 0, o cache fica desativado.
+    """
+    global cache_somas
+    cache_somas = CacheSomas(limite_denso, capacidade_lru) if limite_denso or capacidade_lru else None
+    return cache_somas
+
+def estatisticas_cache_somas() -> Dict:
+    """
+    Acertos, faltas, taxa de acertos, descartes do LRU e ocupação do cache.
+    """
+    if cache_somas is None:
+        return {}
+    return cache_somas.estatisticas()
+
+def encontrar_numeros_perfeitos_tabela(somas: List[int], inicio: int = 1) -> List[int]:
+    """
+    Extrai os números perfeitos a partir de uma tabela de somas de divisores.
+    Tabelas NumPy são comparadas de forma vetorizada (s[n] == n).
+    """
+    if np is not None and isinstance(somas, np.ndarray):
+        perfeitos = []
+        for base in range(max(inicio, 1), len(somas), BLOCO_NUMPY):
+            bloco = somas[base:base + BLOCO_NUMPY]
+            numeros = np.arange(base, base + len(bloco), dtype=np.int64)
+            perfeitos.extend(numeros[bloco == numeros].tolist())
+        return perfeitos
+    return [n for n in range(max(inicio, 1), len(somas)) if somas[n] == n]
+
+def encontrar_pares_amigaveis_tabela(somas: List[int]) -> List[Tuple[int, int]]:
+    """
+    Extrai os pares amigáveis a partir de uma tabela de somas de divisores.
+    Cada par é encontrado uma única vez, a partir do seu menor elemento.
+    Tabelas NumPy são verificadas de forma vetorizada (s[s[n]] == n).
+    """
+    limite = len(somas) - 1
+    if np is not None and isinstance(somas, np.ndarray):
+        return encontrar_pares_amigaveis_tabela_numpy(somas)
+    
+    pares_amigaveis = []
+    
+    for n in range(1, limite + 1):
+        soma_n = somas[n]
+        if n < soma_n <= limite and somas[soma_n] == n:
+            pares_amigaveis.append((n, soma_n))
+    
+    return pares_amigaveis
+
+def encontrar_pares_amigaveis_tabela_numpy(somas) -> List[Tuple[int, int]]:
+    """
+    Versão vetorizada da busca de pares: seleciona os candidatos com
+    n < s[n] <= limite e confirma de uma vez quais satisfazem s[s[n]] == n.
+    """
+    limite = len(somas) - 1
+    pares_amigaveis = []
+    
+    # Processa em blocos para limitar os arrays temporários
+    for base in range(0, limite + 1, BLOCO_NUMPY):
+        bloco = somas[base:base + BLOCO_NUMPY]
+        numeros = np.arange(base, base + len(bloco), dtype=np.int64)
+        candidatos = numeros[(bloco > numeros) & (bloco <= limite)]
+        
+        parceiros = somas[candidatos]
+        confirmados = somas[parceiros] == candidatos
+        pares_amigaveis.extend(zip(candidatos[confirmados].tolist(), parceiros[confirmados].tolist()))
+    
+    return pares_amigaveis
+
+def encontrar_ciclos_aliquotas_tabela(somas: List[int], inicio: int = 1,
+                                      comprimento_maximo: int = COMPRIMENTO_MAXIMO_CICLO_PADRAO) -> List[Tuple[int, ...]]:
+    """
+    Encontra os ciclos da sequência alíquota n -> s(n) com todos os elementos
+    na tabela, comprimento até comprimento_maximo e menor elemento >= inicio:
+    comprimento 1 são os perfeitos, 2 os pares amigáveis e 3 ou mais os
+    ciclos sociáveis.
+    
+    A tabela é tratada como um grafo em que cada n aponta para s(n). Cada
+    caminho é seguido até sair da tabela ou chegar a um número já visitado;
+    os números do caminho ficam marcados, então nenhum é percorrido duas vezes
+    e a varredura é linear no tamanho da tabela. Um ciclo é detectado quando o
+    caminho reencontra um número dele mesmo.
+    
+    Cada ciclo é devolvido como tupla começando pelo seu menor elemento, e a
+    lista vem ordenada por esse elemento.
+    """
+    limite = len(somas) - 1
+    if np is not None and isinstance(somas, np.ndarray):
+        somas = somas.tolist()
+    
+    # 0 = não visitado, 1 = no caminho atual, 2 = já resolvido
+    estado = bytearray(limite + 1)
+    ciclos = []
+    
+    for n in range(max(inicio, 1), limite + 1):
+        if estado[n]:
+            continue
+        caminho = []
+        x = n
+        while 1 <= x <= limite and not estado[x]:
+            estado[x] = 1
+            caminho.append(x)
+            x = somas[x]
+        
+        if 1 <= x <= limite and estado[x] == 1:
+            ciclo = caminho[caminho.index(x):]
+            menor = min(ciclo)
+            if len(ciclo) <= comprimento_maximo and menor >= inicio:
+                posicao = ciclo.index(menor)
+                ciclos.append(tuple(ciclo[posicao:] + ciclo[:posicao]))
+        for x in caminho:
+            estado[x] = 2
+    
+    return sorted(ciclos)
+
+def gerar_primos(limite: int) -> List[int]:
+    """
+    Gera todos os primos até o limite pelo crivo de Eratóstenes.
+    """
+    if limite < 2:
+        return []
+    
+    crivo = bytearray([1]) * (limite + 1)
+    crivo[0] = crivo[1] = 0
+    for i in range(2, math.isqrt(limite) + 1):
+        if crivo[i]:
+            crivo[i * i::i] = bytes(len(range(i * i, limite + 1, i)))
+    
+    return [i for i in range(limite + 1) if crivo[i]]
+
+def calcular_somas_divisores_segmento(inicio: int, fim: int, primos: List[int] = None) -> List[int]:
+    """
+    Calcula as somas de divisores próprios apenas da janela [inicio, fim]
+    (crivo segmentado), sem passar pelos números de 1 a inicio - 1.
+    
+    Para cada primo p <= √fim, os múltiplos de p na janela têm a potência de p
+    removida e sigma multiplicada por 1 + p + ... + p^k. O que sobra após
+    todos os primos é 1 ou um único primo maior que √fim.
+    
+    Retorna uma lista onde somas[i] = sigma(inicio + i) - (inicio + i).
+    Requer inicio >= 1; `primos` deve cobrir todos os primos até √fim.
+    """
+    if inicio < 1:
+        raise ValueError("O crivo segmentado requer inicio >= 1")
+    if fim < inicio:
+        return []
+    if primos is None:
+        primos = gerar_primos(math.isqrt(fim))
+    
+    tamanho = fim - inicio + 1
+    restante = list(range(inicio, fim + 1))
+    sigma = [1] * tamanho
+    
+    for p in primos:
+        if p * p > fim:
+            break
+        # Primeiro índice da janela divisível por p
+        for i in range((-inicio) % p, tamanho, p):
+            r = restante[i] // p
+            potencia = p
+            soma_potencia = 1 + p
+            while r % p == 0:
+                r //= p
+                potencia *= p
+                soma_potencia += potencia
+            restante[i] = r
+            sigma[i] *= soma_potencia
+    
+    somas = sigma
+    for i in range(tamanho):
+        r = restante[i]
+        if r > 1:
+            # Fator primo restante maior que √fim
+            somas[i] *= r + 1
+        somas[i] -= inicio + i
+    
+    return somas
+
+def calcular_soma_divisores_primos(n: int, primos: List[int]) -> int:
+    """
+    Calcula a soma dos divisores próprios de n fatorando-o pela lista de primos,
+    que deve cobrir todos os primos até √n.
+    """
+    if n <= 1:
+        return 0
+    
+    r = n
+    sigma = 1
+    for p in primos:
+        if p * p > r:
+            break
+        if r % p == 0:
+            r //= p
+            potencia = p
+            soma_potencia = 1 + p
+            while r % p == 0:
+                r //= p
+                potencia *= p
+                soma_potencia += potencia
+            sigma *= soma_potencia
+    if r > 1:
+        sigma *= r + 1
+    
+    return sigma - n
+
+def pode_ser_par_amigavel(a: int, b: int, primos_filtro: List[int]) -> bool:
+    """
+    Filtro barato para descartar candidatos a par (a, b = s(a)) sem fatorar b
+    por completo. Precisa valer sigma(b) = a + b.
+    
+    Removendo de b os primos até P = primos_filtro[-1], sobra b = f * r, com r
+    sem fatores <= P. Como sigma(b) = sigma(f) * sigma(r) e cada fator primo de
+    r contribui com menos de (P + 1) / P para sigma(r) / r, o quociente
+    (a + b) / sigma(f) precisa ser inteiro e estar em (r, r * ((P + 1) / P)^k],
+    com k o número máximo de fatores primos de r.
+    """
+    r = b
+    sigma_f = 1
+    for p in primos_filtro:
+        if r % p == 0:
+            r //= p
+            potencia = p
+            soma_potencia = 1 + p
+            while r % p == 0:
+                r //= p
+                potencia *= p
+                soma_potencia += potencia
+            sigma_f *= soma_potencia
+    
+    alvo = a + b
+    if r == 1:
+        return sigma_f == alvo
+    if alvo % sigma_f:
+        return False
+    
+    quociente = alvo // sigma_f
+    if quociente <= r:
+        return False
+    
+    maior_primo = primos_filtro[-1]
+    k = int(math.log(r) / math.log(maior_primo + 1)) + 1
+    return quociente <= r * ((maior_primo + 1) / maior_primo) ** k
+
+def iter_segmentos(inicio: int = 1, fim: int = None, limite_parceiros: int = None,
+                   tamanho_segmento: int = TAMANHO_SEGMENTO_PADRAO,
+                   coletar_pendentes: bool = False,
+                   pares_abaixo_de: int = None) -> Iterator[Tuple[int, int, List[int], List[Tuple[int, int]], List[Tuple[int, int]]]]:
+    """
+    Percorre [inicio, fim] pelo crivo segmentado e produz, a cada segmento
+    concluído, a tupla (inicio_segmento, fim_segmento, perfeitos, pares,
+    pendentes). A memória fica limitada a um segmento, qualquer que seja o
+    tamanho do intervalo; com fim=None o intervalo não tem fim.
+    
+    Um par amigável pertence ao segmento que contém o seu MENOR elemento; o
+    parceiro pode estar fora dele, até limite_parceiros (padrão: fim, ou sem
+    limite quando fim=None). Assim, janelas disjuntas de um intervalo maior
+    dividem o trabalho sem repetir pares, desde que usem o mesmo limite_parceiros.
+    
+    Parceiros dentro do segmento são consultados na tabela; os demais passam
+    pelo filtro pode_ser_par_amigavel e só então são fatorados.
+    
+    Com coletar_pendentes=True, `pendentes` traz as ligações (n, s(n)) com
+    s(n) além de limite_parceiros que passam pelo filtro: são os únicos
+    candidatos a par quando o intervalo for estendido depois.
+    
+    Com pares_abaixo_de, os pares (s(n), n) com o menor elemento s(n) abaixo
+    de pares_abaixo_de também saem no segmento do maior elemento n. Serve para
+    quem analisa [inicio, fim] sozinho (pares_abaixo_de=inicio) e quer também
+    os pares que cruzam o início do intervalo, como nas engines de tabela.
+    """
+    inicio = max(inicio, 1)
+    if limite_parceiros is None:
+        limite_parceiros = fim
+    if fim is not None and fim < inicio:
+        return
+    
+    # Primos até √limite, ampliados (dobrando) quando o intervalo não tem fim
+    primos = []
+    limite_primos = 0
+    
+    def garantir_primos(n):
+        nonlocal primos, limite_primos
+        if limite_primos < math.isqrt(n):
+            limite_primos = max(math.isqrt(n), 2 * limite_primos)
+            primos = gerar_primos(limite_primos)
+    
+    if fim is not None:
+        garantir_primos(max(fim, limite_parceiros))
+    primos_filtro = gerar_primos(LIMITE_PRIMOS_FILTRO)
+    primos_pendentes = [p for p in primos_filtro if p <= LIMITE_PRIMOS_FILTRO_PENDENTES]
+    
+    inicio_segmento = inicio
+    while fim is None or inicio_segmento <= fim:
+        fim_segmento = inicio_segmento + tamanho_segmento - 1
+        if fim is not None:
+            fim_segmento = min(fim_segmento, fim)
+        garantir_primos(fim_segmento)
+        with medir('segmento.somas_divisores'):
+            somas = calcular_somas_divisores_segmento(inicio_segmento, fim_segmento, primos)
+        if limite_parceiros is None:
+            garantir_primos(max(somas))
+        
+        perfeitos = []
+        pares_amigaveis = []
+        pendentes = []
+        with medir('segmento.perfeitos_e_parceiros'):
+            for i, soma_n in enumerate(somas):
+                n = inicio_segmento + i
+                if soma_n == n:
+                    perfeitos.append(n)
+                elif n < soma_n and (limite_parceiros is None or soma_n <= limite_parceiros):
+                    if soma_n <= fim_segmento:
+                        eh_par = somas[soma_n - inicio_segmento] == n
+                    else:
+                        eh_par = (pode_ser_par_amigavel(n, soma_n, primos_filtro) and
+                                  calcular_soma_divisores_primos(soma_n, primos) == n)
+                    if eh_par:
+                        pares_amigaveis.append((n, soma_n))
+                elif coletar_pendentes and n < soma_n and pode_ser_par_amigavel(n, soma_n, primos_pendentes):
+                    pendentes.append((n, soma_n))
+                elif (pares_abaixo_de is not None and 1 < soma_n < pares_abaixo_de and
+                      pode_ser_par_amigavel(soma_n, n, primos_filtro) and
+                      calcular_soma_divisores_primos(soma_n, primos) == n):
+                    pares_amigaveis.append((soma_n, n))
+        
+        yield inicio_segmento, fim_segmento, perfeitos, pares_amigaveis, pendentes
+        inicio_segmento = fim_segmento + 1
+
+def analisar_janela_segmentada(inicio: int, fim: int, limite_parceiros: int = None,
+                               tamanho_segmento: int = TAMANHO_SEGMENTO_PADRAO,
+                               pendentes: List[Tuple[int, int]] = None,
+                               pares_abaixo_de: int = None) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """
+    Encontra números perfeitos e pares amigáveis processando apenas a janela
+    [inicio, fim], um segmento de cada vez (ver iter_segmentos).
+    
+    Se a lista `pendentes` for informada, recebe as ligações pendentes de
+    todos os segmentos. pares_abaixo_de é repassado a iter_segmentos.
+    
+    Retorna (perfeitos, pares_amigaveis), ambos em ordem crescente.
+    """
+    perfeitos = []
+    pares_amigaveis = []
+    
+    for _, _, perfeitos_segmento, pares_segmento, pendentes_segmento in iter_segmentos(
+            inicio, fim, limite_parceiros, tamanho_segmento, pendentes is not None, pares_abaixo_de):
+        perfeitos.extend(perfeitos_segmento)
+        pares_amigaveis.extend(pares_segmento)
+        if pendentes is not None:
+            pendentes.extend(pendentes_segmento)
+    
+    return perfeitos, pares_amigaveis
+
+def iter_pares_amigaveis(inicio: int = 1, fim: int = None, limite_parceiros: int = None) -> Iterator[Tuple[int, int]]:
+    """
+    Gera os pares amigáveis com o menor elemento em [inicio, fim], em ordem
+    crescente, à medida que cada segmento é concluído. Com fim=None, a busca
+    continua indefinidamente; a memória usada não depende do tamanho do intervalo.
+    """
+    for _, _, _, pares_segmento, _ in iter_segmentos(inicio, fim, limite_parceiros):
+        yield from pares_segmento
+
+def iter_perfeitos(inicio: int = 1, fim: int = None) -> Iterator[int]:
+    """
+    Gera os números perfeitos em [inicio, fim], em ordem crescente, à medida
+    que cada segmento é concluído.
+    
+    Com fim=None, a busca continua indefinidamente pelos primos de Mersenne
+    (iter_numeros_perfeitos_pares) em vez de percorrer todos os inteiros: como
+    em encontrar_numeros_perfeitos, não há busca de perfeitos ímpares.
+    """
+    if fim is None:
+        for perfeito in iter_numeros_perfeitos_pares():
+            if perfeito >= inicio:
+                yield perfeito
+        return
+    for _, _, perfeitos_segmento, _, _ in iter_segmentos(inicio, fim):
+        yield from perfeitos_segmento
 
 def eh_numero_perfeito(n: int) -> bool:
     """
@@ -31,50 +604,84 @@ def eh_numero_perfeito(n: int) -> bool:
     """
     return n > 0 and calcular_soma_divisores(n) == n
 
-def encontrar_numeros_perfeitos(limite: int) -> List[int]:
+def teste_lucas_lehmer(p: int) -> bool:
     """
-    Encontra todos os números perfeitos até o limite especificado.
+    Teste de Lucas–Lehmer: para p primo, 2^p - 1 é primo se e só se
+    s(p-2) = 0 (mod 2^p - 1), com s(0) = 4 e s(k+1) = s(k)² - 2.
     
-    Utiliza a fórmula de Euclides para números perfeitos pares:
-    Se 2^p - 1 é primo (primo de Mersenne), então 2^(p-1) * (2^p - 1) é perfeito.
+    A redução módulo 2^p - 1 usa máscara e deslocamento em vez de divisão,
+    pois 2^p = 1 (mod 2^p - 1).
     """
-    perfeitos = []
-    
-    # Método otimizado usando primos de Mersenne para números pares
-    def eh_primo(n):
-        if n < 2:
-            return False
-        if n == 2:
-            return True
-        if n % 2 == 0:
-            return False
-        for i in range(3, int(math.sqrt(n)) + 1, 2):
-            if n % i == 0:
-                return False
+    if p == 2:
         return True
+    mersenne = (1 << p) - 1
+    s = 4
+    for _ in range(p - 2):
+        s = s * s - 2
+        s = (s & mersenne) + (s >> p)
+        if s >= mersenne:
+            s -= mersenne
+    return s == 0
+
+def calcular_expoentes_mersenne(limite_expoente: int) -> List[int]:
+    """
+    Retorna os expoentes de Mersenne p <= limite_expoente (2^p - 1 primo).
+    
+    Os resultados ficam em cache no módulo: só os expoentes ainda não testados
+    passam pelo teste de Lucas–Lehmer, e apenas os primos (se p é composto,
+    2^p - 1 também é).
+    """
+    global maior_expoente_testado
+    for p in range(maior_expoente_testado + 1, limite_expoente + 1):
+        if eh_primo(p) and teste_lucas_lehmer(p):
+            expoentes_mersenne.append(p)
+        maior_expoente_testado = p
+    return [p for p in expoentes_mersenne if p <= limite_expoente]
+
+def iter_numeros_perfeitos_pares() -> Iterator[int]:
+    """
+    Gera os números perfeitos pares em ordem crescente, sem limite, estendendo
+    o cache de expoentes de Mersenne um expoente de cada vez.
     
-    # Verifica números perfeitos usando fórmula de Euclides
-    p = 2
+    O gerador guarda a sua posição no cache, que outras chamadas podem
+    estender entre dois next() sem que nenhum perfeito seja pulado.
+    """
+    indice = 0
     while True:
-        mersenne = (2 ** p) - 1
-        if eh_primo(mersenne):
-            perfeito = (2 ** (p - 1)) * mersenne
-            if perfeito > limite:
-                break
-            perfeitos.append(perfeito)
-        
-        p += 1
-        # Limite prático para evitar overflow
-        if p > 50:
-            break
+        while indice >= len(expoentes_mersenne):
+            calcular_expoentes_mersenne(maior_expoente_testado + 1)
+        p = expoentes_mersenne[indice]
+        indice += 1
+        yield (1 << (p - 1)) * ((1 << p) - 1)
+
+def encontrar_numeros_perfeitos(limite: int, engine: str = ENGINE_PADRAO) -> List[int]:
+    """
+    Encontra todos os números perfeitos até o limite especificado.
+    
+    Com engine='divisao', utiliza a fórmula de Euclides para números perfeitos pares:
+    Se 2^p - 1 é primo (primo de Mersenne), então 2^(p-1) * (2^p - 1) é perfeito.
+    Só os expoentes p que cabem no limite são testados (ver
+    calcular_expoentes_mersenne), então limites astronômicos respondem rápido.
+    Não há busca de ímpares: nenhum perfeito ímpar é conhecido, e está provado
+    que não existe nenhum abaixo de 10^1500.
+    Com engine='crivo' ou 'numpy', consulta a tabela de somas de divisores até o limite.
+    Com engine='segmentado', percorre o intervalo segmento a segmento.
+    """
+    validar_engine(engine)
+    if engine == 'segmentado':
+        return analisar_janela_segmentada(1, limite)[0]
+    if engine != 'divisao':
+        return encontrar_numeros_perfeitos_tabela(calcular_tabela_somas(limite, engine))
     
-    # Verifica números ímpares perfeitos por força bruta (muito raros)
-    # Nota: Não se conhece nenhum número perfeito ímpar
-    for n in range(1, min(limite + 1, 10000), 2):  # Limite menor para ímpares
-        if eh_numero_perfeito(n):
-            perfeitos.append(n)
+    # 2^(p-1) * (2^p - 1) tem 2p - 1 bits, então só expoentes até este cabem no limite
+    limite_expoente = (max(limite, 0).bit_length() + 1) // 2
+    perfeitos = []
+    for p in calcular_expoentes_mersenne(limite_expoente):
+        perfeito = (1 << (p - 1)) * ((1 << p) - 1)
+        if perfeito <= limite:
+            perfeitos.append(perfeito)
     
-    return sorted(perfeitos)
+    return perfeitos
 
 def sao_numeros_amigaveis(a: int, b: int) -> bool:
     """
@@ -86,17 +693,30 @@ def sao_numeros_amigaveis(a: int, b: int) -> bool:
             calcular_soma_divisores(a) == b and 
             calcular_soma_divisores(b) == a)
 
-def encontrar_pares_amigaveis(limite: int) -> List[Tuple[int, int]]:
+def encontrar_pares_amigaveis(limite: int, engine: str = ENGINE_PADRAO) -> List[Tuple[int, int]]:
     """
     Encontra todos os pares de números amigáveis até o limite especificado.
     Otimizado para evitar cálculos duplicados.
+    
+    Com engine='crivo' ou 'numpy', as somas de divisores de 1 a limite são
+    calculadas de uma vez em uma tabela; com engine='divisao', número a número.
+    Com engine='segmentado', a tabela é calculada segmento a segmento.
     """
-    pares_amigaveis = []
+    validar_engine(engine)
+    if engine == 'segmentado':
+        return analisar_janela_segmentada(1, limite)[1]
+    if engine != 'divisao':
+        return encontrar_pares_amigaveis_tabela(calcular_tabela_somas(limite, engine))
+    
+    pares_amigaveis = set()
     soma_divisores_cache = {}
     
     def obter_soma_divisores(n):
         if n not in soma_divisores_cache:
+            contar('cache_somas_faltas')
             soma_divisores_cache[n] = calcular_soma_divisores(n)
+        else:
+            contar('cache_somas_acertos')
         return soma_divisores_cache[n]
     
     verificados = set()
@@ -114,28 +734,53 @@ def encontrar_pares_amigaveis(limite: int) -> List[Tuple[int, int]]:
             if soma_soma_n == n:
                 # Encontrou par amigável
                 par = tuple(sorted([n, soma_n]))
-                if par not in pares_amigaveis:
-                    pares_amigaveis.append(par)
+                pares_amigaveis.add(par)
                 verificados.add(n)
                 verificados.add(soma_n)
     
     return sorted(pares_amigaveis)
 
-def analisar_intervalo(inicio: int, fim: int) -> Dict:
+def analisar_intervalo(inicio: int, fim: int, engine: str = ENGINE_PADRAO,
+                       limite_parceiros: int = None) -> Dict:
     """
     Analisa um intervalo e retorna informações sobre números perfeitos e amigáveis.
+    Com engine='crivo' ou 'numpy', a mesma tabela de somas é usada nas duas buscas.
+    
+    Com engine='segmentado', apenas a janela [inicio, fim] é processada, com o
+    parceiro dos pares até limite_parceiros (padrão: fim). Os pares que cruzam
+    o início (menor elemento abaixo de inicio) são conferidos por s(s(n)) == n,
+    então o resultado é o mesmo das outras engines. Para dividir um intervalo
+    grande entre processos ou máquinas, sem repetir pares, use
+    analisar_janela_segmentada.
     """
+    validar_engine(engine)
     print(f"Analisando intervalo de {inicio} a {fim}...")
     
-    # Encontrar números perfeitos no intervalo
-    perfeitos = [n for n in encontrar_numeros_perfeitos(fim) if n >= inicio]
+    if engine == 'segmentado':
+        perfeitos, todos_pares = analisar_janela_segmentada(inicio, fim, limite_parceiros, pares_abaixo_de=inicio)
+        # Os pares que cruzam o início saem na posição do maior elemento
+        todos_pares.sort()
+    elif engine != 'divisao':
+        with medir('intervalo.somas_divisores'):
+            somas = calcular_tabela_somas(fim, engine)
+        with medir('intervalo.perfeitos'):
+            perfeitos = encontrar_numeros_perfeitos_tabela(somas, inicio)
+        with medir('intervalo.pares'):
+            todos_pares = encontrar_pares_amigaveis_tabela(somas)
+    else:
+        # Encontrar números perfeitos no intervalo
+        with medir('intervalo.perfeitos'):
+            perfeitos = [n for n in encontrar_numeros_perfeitos(fim, engine) if n >= inicio]
+        
+        # Encontrar pares amigáveis no intervalo
+        with medir('intervalo.pares'):
+            todos_pares = encontrar_pares_amigaveis(fim, engine)
     
-    # Encontrar pares amigáveis no intervalo
-    todos_pares = encontrar_pares_amigaveis(fim)
-    pares_no_intervalo = [
-        par for par in todos_pares 
-        if par[0] >= inicio or par[1] >= inicio
-    ]
+    with medir('intervalo.filtragem'):
+        pares_no_intervalo = [
+            par for par in todos_pares 
+            if par[0] >= inicio or par[1] >= inicio
+        ]
     
     return {
         'intervalo': (inicio, fim),
@@ -145,12 +790,46 @@ def analisar_intervalo(inicio: int, fim: int) -> Dict:
         'total_pares_amigaveis': len(pares_no_intervalo)
     }
 
+def analisar_ciclos_aliquotas(inicio: int, fim: int, comprimento_maximo: int = COMPRIMENTO_MAXIMO_CICLO_PADRAO,
+                              engine: str = ENGINE_PADRAO, limite_membros: int = None) -> Dict:
+    """
+    Levantamento dos ciclos alíquotas com menor elemento em [inicio, fim] e
+    todos os elementos até limite_membros (padrão: fim), de comprimento até
+    comprimento_maximo (ver encontrar_ciclos_aliquotas_tabela).
+    
+    A tabela de somas vem de calcular_tabela_somas ('crivo' ou 'numpy'; as
+    demais engines usam o crivo), inclusive do armazenamento persistente.
+    """
+    validar_engine(engine)
+    if limite_membros is None:
+        limite_membros = fim
+    print(f"Procurando ciclos alíquotas de {inicio} a {fim}...")
+    
+    tempo_inicio = time.time()
+    somas = calcular_tabela_somas(limite_membros, 'numpy' if engine == 'numpy' else 'crivo')
+    ciclos = [ciclo for ciclo in encontrar_ciclos_aliquotas_tabela(somas, inicio, comprimento_maximo)
+              if ciclo[0] <= fim]
+    tempo_execucao = time.time() - tempo_inicio
+    
+    ciclos_por_comprimento = defaultdict(int)
+    for ciclo in ciclos:
+        ciclos_por_comprimento[len(ciclo)] += 1
+    
+    return {
+        'intervalo': (inicio, fim),
+        'ciclos': ciclos,
+        'ciclos_sociaveis': [ciclo for ciclo in ciclos if len(ciclo) >= 3],
+        'ciclos_por_comprimento': dict(sorted(ciclos_por_comprimento.items())),
+        'total_ciclos': len(ciclos),
+        'tempo_execucao': tempo_execucao
+    }
+
 def verificar_numero_especifico(n: int) -> Dict:
     """
     Analisa um número específico para verificar suas propriedades.
     """
     soma_divisores = calcular_soma_divisores(n)
-    eh_perfeito = eh_numero_perfeito(n)
+    eh_perfeito = n > 0 and soma_divisores == n
     
     # Verifica se tem par amigável
     par_amigavel = None
@@ -165,6 +844,77 @@ def verificar_numero_especifico(n: int) -> Dict:
         'eh_amigavel': par_amigavel is not None
     }
 
+def calcular_somas_lote(numeros, somas: Dict[int, int] = None) -> Dict[int, int]:
+    """
+    Calcula s(n) uma única vez para cada número distinto de `numeros` e
+    devolve o dicionário {n: s(n)} (acrescentado a `somas`, se informado).
+    
+    Números já presentes no armazenamento persistente ou no cache de somas
+    (se ativo) são lidos deles; números pequenos e densos saem de uma única
+    tabela do crivo; os demais são fatorados (tabela de primos pequenos
+    compartilhada e rho de Pollard). Os calculados vão para o cache.
+    """
+    if somas is None:
+        somas = {}
+    faltantes = []
+    for n in set(numeros):
+        if n in somas:
+            continue
+        soma = armazenamento.obter(n) if armazenamento is not None else None
+        if soma is None and cache_somas is not None and n > 1:
+            soma = cache_somas.obter(n)
+        if n <= 1:
+            somas[n] = 0
+        elif soma is not None:
+            somas[n] = soma
+        else:
+            faltantes.append(n)
+    
+    calculados = faltantes
+    pequenos = [n for n in faltantes if n <= LIMITE_TABELA_LOTE]
+    if pequenos and len(pequenos) * FATOR_DENSIDADE_LOTE >= max(pequenos):
+        tabela = calcular_somas_divisores_crivo(max(pequenos))
+        for n in pequenos:
+            somas[n] = tabela[n]
+        faltantes = [n for n in faltantes if n > LIMITE_TABELA_LOTE]
+    
+    for n in faltantes:
+        somas[n] = soma_divisores_fatoracao(n)
+    
+    if cache_somas is not None:
+        for n in calculados:
+            cache_somas.guardar(n, somas[n])
+    return somas
+
+def classificar_numeros(numeros) -> Dict[str, List]:
+    """
+    Classifica em lote uma coleção de inteiros quaisquer (fora de ordem, com
+    repetições, de qualquer tamanho), como verificar_numero_especifico faria
+    para cada um, mas calculando cada soma de divisores uma única vez.
+    
+    As somas dos números e as dos seus possíveis parceiros amigáveis são
+    obtidas por calcular_somas_lote, em duas rodadas.
+    
+    Retorna um resultado em colunas, uma linha por número distinto em ordem
+    crescente: {'numero': [...], 'soma_divisores_proprios': [...],
+    'eh_perfeito': [...], 'par_amigavel': [...], 'eh_amigavel': [...]}.
+    """
+    distintos = sorted({int(n) for n in numeros})
+    somas = calcular_somas_lote(distintos)
+    
+    # Segunda rodada: s(s(n)) para os candidatos a par amigável
+    calcular_somas_lote([somas[n] for n in distintos if somas[n] != n], somas)
+    
+    colunas = {
+        'numero': distintos,
+        'soma_divisores_proprios': [somas[n] for n in distintos],
+        'eh_perfeito': [n > 0 and somas[n] == n for n in distintos],
+        'par_amigavel': [somas[n] if somas[n] != n and somas[somas[n]] == n else None
+                         for n in distintos],
+    }
+    colunas['eh_amigavel'] = [par is not None for par in colunas['par_amigavel']]
+    return colunas
+
 # Exemplo de uso e testes
 if __name__ == "__main__":
     print("=== VERIFICADOR DE NÚMEROS PERFEITOS E AMIGÁVEIS ===\n")
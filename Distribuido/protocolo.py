@@ -0,0 +1,107 @@
+import struct
+from typing import List, Tuple
+from instrumentacao import contar
+
+# Protocolo de comunicação entre servidor e clientes.
+# Cada mensagem é enviada como um quadro: cabeçalho de 5 bytes com o tipo
+# (1 byte) e o tamanho do corpo (4 bytes, big-endian), seguido do corpo.
+# Os números trafegam como inteiros binários sem sinal de 64 bits.
+CABECALHO = struct.Struct('!BI')
+
+# Tipos de mensagem.
+INTERVALO = 1  # servidor -> cliente: tarefa (id, inicio, fim, limite_parceiros, pares_abaixo_de)
+PARCIAL = 2    # cliente -> servidor: resultado de uma subfaixa concluída
+FIM = 3        # cliente -> servidor: tarefa inteira concluída (tempo total e por núcleo)
+REGISTRO = 4   # cliente -> servidor: primeira mensagem após conectar (núcleos do cliente)
+HEARTBEAT = 5  # cliente -> servidor: sinal periódico de que o cliente segue vivo
+ENCERRAR = 6   # servidor -> cliente: não há mais tarefas, o cliente pode sair
+PEDIDO = 7     # cliente -> servidor: cliente livre, pede a próxima faixa
+
+# Todas as mensagens de uma tarefa carregam o seu id, pois a mesma conexão
+# atende a várias tarefas ao longo do tempo.
+FORMATO_INTERVALO = struct.Struct('!IQQQQ')
+FORMATO_PARCIAL = struct.Struct('!IQQIII')  # id, subfaixa, qtd. de perfeitos, de pares e de pendentes
+FORMATO_FIM = struct.Struct('!IdI')  # id, tempo total, qtd. de tempos por núcleo
+FORMATO_REGISTRO = struct.Struct('!I')
+
+# Leitura de exatamente `tamanho` bytes, acumulando quantas leituras TCP forem necessárias.
+def receber_exato(sock, tamanho: int) -> bytes:
+    partes = []
+    restante = tamanho
+    while restante > 0:
+        dados = sock.recv(min(restante, 1 << 16))
+        if not dados:
+            raise ConnectionError("Conexão encerrada no meio de uma mensagem")
+        partes.append(dados)
+        restante -= len(dados)
+    return b''.join(partes)
+
+# Toda mensagem enviada passa por aqui, então os contadores de envio ficam neste ponto.
+def codificar_mensagem(tipo: int, corpo: bytes = b'') -> bytes:
+    contar('mensagens_enviadas')
+    contar('bytes_enviados', CABECALHO.size + len(corpo))
+    return CABECALHO.pack(tipo, len(corpo)) + corpo
+
+def enviar_mensagem(sock, tipo: int, corpo: bytes = b''):
+    sock.sendall(codificar_mensagem(tipo, corpo))
+
+def receber_mensagem(sock) -> Tuple[int, bytes]:
+    tipo, tamanho = CABECALHO.unpack(receber_exato(sock, CABECALHO.size))
+    contar('mensagens_recebidas')
+    contar('bytes_recebidos', CABECALHO.size + tamanho)
+    return tipo, receber_exato(sock, tamanho)
+
+# Versão para asyncio.StreamReader; IncompleteReadError indica conexão encerrada.
+async def receber_mensagem_async(reader) -> Tuple[int, bytes]:
+    tipo, tamanho = CABECALHO.unpack(await reader.readexactly(CABECALHO.size))
+    contar('mensagens_recebidas')
+    contar('bytes_recebidos', CABECALHO.size + tamanho)
+    return tipo, await reader.readexactly(tamanho)
+
+# pares_abaixo_de é o início global do intervalo (0 quando não há pares abaixo
+# dele a confirmar), para que o cliente com o maior elemento de um par que
+# atravessa o início global também o reporte.
+def codificar_intervalo(id_tarefa: int, inicio: int, fim: int, limite_parceiros: int,
+                        pares_abaixo_de: int = 0) -> bytes:
+    return FORMATO_INTERVALO.pack(id_tarefa, inicio, fim, limite_parceiros, pares_abaixo_de)
+
+def decodificar_intervalo(corpo: bytes) -> Tuple[int, int, int, int, int]:
+    return FORMATO_INTERVALO.unpack(corpo)
+
+# Resultado parcial: cabeçalho da subfaixa seguido dos perfeitos, dos pares e das
+# ligações pendentes (n, s(n)) com s(n) além do limite de parceiros (achatados).
+def codificar_parcial(id_tarefa: int, inicio: int, fim: int, perfeitos: List[int],
+                      pares: List[Tuple[int, int]], pendentes: List[Tuple[int, int]] = ()) -> bytes:
+    valores = list(perfeitos)
+    for a, b in pares:
+        valores.extend((a, b))
+    for a, b in pendentes:
+        valores.extend((a, b))
+    return (FORMATO_PARCIAL.pack(id_tarefa, inicio, fim, len(perfeitos), len(pares), len(pendentes)) +
+            struct.pack(f'!{len(valores)}Q', *valores))
+
+def decodificar_parcial(corpo: bytes) -> Tuple[int, int, int, List[int], List[Tuple[int, int]], List[Tuple[int, int]]]:
+    id_tarefa, inicio, fim, qtd_perfeitos, qtd_pares, qtd_pendentes = FORMATO_PARCIAL.unpack_from(corpo)
+    valores = struct.unpack_from(f'!{qtd_perfeitos + 2 * (qtd_pares + qtd_pendentes)}Q', corpo, FORMATO_PARCIAL.size)
+    perfeitos = list(valores[:qtd_perfeitos])
+    ligacoes = list(zip(valores[qtd_perfeitos::2], valores[qtd_perfeitos + 1::2]))
+    return id_tarefa, inicio, fim, perfeitos, ligacoes[:qtd_pares], ligacoes[qtd_pares:]
+
+# Fim da tarefa: tempo total do cliente seguido do tempo ocupado de cada núcleo.
+def codificar_fim(id_tarefa: int, tempo_processamento: float, tempos_nucleos: List[float] = ()) -> bytes:
+    return (FORMATO_FIM.pack(id_tarefa, tempo_processamento, len(tempos_nucleos)) +
+            struct.pack(f'!{len(tempos_nucleos)}d', *tempos_nucleos))
+
+def decodificar_fim(corpo: bytes) -> Tuple[int, float, List[float]]:
+    id_tarefa, tempo_processamento, qtd_nucleos = FORMATO_FIM.unpack_from(corpo)
+    tempos_nucleos = list(struct.unpack_from(f'!{qtd_nucleos}d', corpo, FORMATO_FIM.size))
+    return id_tarefa, tempo_processamento, tempos_nucleos
+
+def codificar_registro(num_nucleos: int) -> bytes:
+    return FORMATO_REGISTRO.pack(num_nucleos)
+
+# Registro sem corpo vale como cliente de um núcleo.
+def decodificar_registro(corpo: bytes) -> int:
+    if not corpo:
+        return 1
+    return FORMATO_REGISTRO.unpack(corpo)[0]
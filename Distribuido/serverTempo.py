@@ -1,106 +1,514 @@
-import socket
-import pickle
+import asyncio
+import math
 import threading
 import time
 import csv
 from datetime import datetime
+from checkpoint import Checkpoint
+from instrumentacao import medir, contar
+from metricas import atender_consulta
+from perfect_or_friendly_seq import gerar_primos, calcular_soma_divisores_primos
+from protocolo import (INTERVALO, PARCIAL, FIM, REGISTRO, HEARTBEAT, ENCERRAR, PEDIDO, codificar_mensagem,
+                       receber_mensagem_async, codificar_intervalo, decodificar_parcial, decodificar_fim,
+                       decodificar_registro)
 
 # Definição de host do servidor como "localhost:12345".
 HOST = 'localhost'
 PORT = 12345
 
-# Função para controlar a comunicação com o client-side.
-def handle_client(conn, addr, intervalo):
-    try:
-        # Envio do intervalo via pickle.
-        conn.sendall(pickle.dumps(intervalo))
+# Porta do endpoint HTTP de métricas (formato Prometheus) do coordenador.
+PORT_METRICAS = 12346
 
-        # Leitura dos dados da comunicação TCP (tamanho máximo de 4096bytes).
-        data = conn.recv(4096)
+# Tempo máximo (em segundos) sem mensagens de um cliente antes de considerá-lo perdido.
+TIMEOUT_HEARTBEAT = 10.0
 
-        # Carrega os dados recebidos na array de resultados.
-        result = pickle.loads(data)
-        results.append(result)
-    finally:
-        # Fechar conexão mesmo em caso de erro.
-        conn.close()
-
-# Função que organiza a distribuição e agregação de resultados para um intervalo
-def executar_distribuicao(inicio, fim, num_clients):
-    global clients, results
-    clients = []  # Resetar a lista de clientes
-    results = []  # Resetar a lista de resultados
-
-    # Criação de socket server-side
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        # Conexão do socket ao host e porta server-side.
-        s.bind((HOST, PORT))
-        s.listen() # Listen às conexões.
-
-        print(f"\nAguardando conexão de {num_clients} clientes em {HOST}:{PORT}...")
-        print(f"Distribuindo intervalo: {inicio} a {fim}")
+# Tamanho das faixas entregues aos clientes. Sem medição de vazão, cada pedido
+# recebe TAMANHO_GRAO_PADRAO números; com grão adaptativo, a faixa é ajustada para
+# que cada cliente leve cerca de TEMPO_ALVO_FAIXA segundos nela.
+TAMANHO_GRAO_PADRAO = 50000
+TAMANHO_GRAO_MINIMO = 1000
+TEMPO_ALVO_FAIXA = 2.0
 
-        # Aguardar até todos os clientes conectarem ao servidor.
-        while len(clients) < num_clients:
-            # Aceitar conexão de cliente.
-            conn, addr = s.accept()
-            # conn: socket do cliente conectado.
-            # addr: endereço do cliente conectado.
-            clients.append((conn, addr))  # Adiciona dados do cliente conectado na array.
-            print(f"Cliente conectado: {addr}")
+# Cada faixa entregue é um lease: se o cliente não concluí-la dentro do prazo
+# (o maior entre TIMEOUT_FAIXA e FATOR_PRAZO_FAIXA vezes o tempo esperado pela
+# vazão do cliente), ela volta para a fila e é entregue a outro cliente.
+TIMEOUT_FAIXA = 30.0
+FATOR_PRAZO_FAIXA = 4.0
 
-        print("Iniciando distribuição de intervalos.")
-        # Marcar início do tempo de execução
-        tempo_inicio = time.time()
-        # Contagem de números para cada intervalos em faixas
-        step = (fim - inicio + 1) // num_clients
-        # (ex: 1-10000 para 4 clientes, cada cliente fica com 2500 números para verificar)
+# Máximo de faixas entregues e não concluídas por cliente. Com mais de uma, o
+# cliente já tem a próxima faixa na fila enquanto processa a atual.
+MAX_FAIXAS_POR_TRABALHADOR = 2
+
+# Fila de conexões pendentes do socket de escuta, para muitos clientes de uma vez.
+BACKLOG_CONEXOES = 512
+
+# Conexão de longa duração com um cliente registrado.
+class Trabalhador:
+    def __init__(self, reader, writer, addr, nucleos=1):
+        self.reader = reader
+        self.writer = writer
+        self.addr = addr # endereço do cliente conectado.
+        self.nucleos = nucleos # Processos locais que o cliente usa em cada faixa.
+        self.ultimo_contato = time.time()
+        self.faixas = set() # Ids das faixas em andamento neste cliente.
+        self.pedidos = 0 # Pedidos de faixa ainda não atendidos.
+        self.vazao = None # Números por segundo medidos nas faixas anteriores.
+        self.numeros_processados = 0 # Números das subfaixas já enviadas, em todos os intervalos.
+        self.faixas_concluidas = 0
+
+    # Apenas enfileira a mensagem no transporte; quem chama aguarda o drain.
+    def enviar(self, tipo, corpo=b''):
+        self.writer.write(codificar_mensagem(tipo, corpo))
+
+# Intervalo em distribuição e os resultados agregados dele.
+class Trabalho:
+    def __init__(self, inicio, fim, registro=None, pares_abaixo_de=None):
+        self.inicio = inicio
+        self.fim = fim
+        # Pares com o menor elemento abaixo deste número (o início global, por
+        # padrão) são reportados pelos clientes que têm o maior elemento.
+        self.pares_abaixo_de = inicio if pares_abaixo_de is None else pares_abaixo_de
+        self.registro = registro # Checkpoint que recebe cada subfaixa concluída (opcional).
+        # Trechos ainda não entregues, em ordem; com checkpoint, só os não concluídos.
+        self.lacunas = registro.faixas_pendentes(inicio, fim) if registro else [(inicio, fim)]
+        self.numeros_total = self.restante()
+        self.numeros_processados = 0 # Números das subfaixas já recebidas (para progresso e ETA).
+        self.iniciado_em = time.time()
+        self.em_andamento = 0
+        self.reenvios = [] # Faixas perdidas aguardando outro cliente.
+        self.faixas = 0
+        self.faixas_reenviadas = 0
+        self.numeros_perfeitos = set()
+        self.pares_amigaveis = set()
+        self.ligacoes_pendentes = set() # (n, s(n)) com s(n) além do fim, para estender o intervalo
+        if registro:
+            perfeitos, pares = registro.resultados(inicio, fim)
+            self.numeros_perfeitos.update(perfeitos)
+            self.pares_amigaveis.update(pares)
+            self.pares_amigaveis.update(registro.pares_cruzados(inicio, fim))
+        self.tempos_nucleos = {} # endereço do cliente -> tempo ocupado somado de cada núcleo
+        self.concluido = asyncio.Event()
+
+    # Faixas perdidas voltam para a fila, então o trabalho só termina completo.
+    def completo(self):
+        return not self.lacunas and not self.reenvios and self.em_andamento == 0
+
+    # Quantidade de números ainda não entregues.
+    def restante(self):
+        return sum(fim - inicio + 1 for inicio, fim in self.lacunas)
+
+    # Retira a próxima faixa de até `tamanho` números dos trechos não entregues.
+    def retirar(self, tamanho):
+        inicio_lacuna, fim_lacuna = self.lacunas[0]
+        faixa_fim = min(fim_lacuna, inicio_lacuna + tamanho - 1)
+        if faixa_fim == fim_lacuna:
+            self.lacunas.pop(0)
+        else:
+            self.lacunas[0] = (faixa_fim + 1, fim_lacuna)
+        return inicio_lacuna, faixa_fim
+
+# Coordenador com pool persistente de clientes: cada cliente conecta e se registra
+# uma única vez e, sempre que fica livre, pede a próxima faixa do trabalho atual.
+# Todas as conexões são atendidas por um único event loop asyncio, que roda em
+# uma thread própria; os métodos síncronos apenas submetem corrotinas a ele.
+class Coordenador:
+    def __init__(self, host=HOST, port=PORT, timeout_heartbeat=TIMEOUT_HEARTBEAT,
+                 tamanho_grao=TAMANHO_GRAO_PADRAO, grao_adaptativo=True, tempo_alvo_faixa=TEMPO_ALVO_FAIXA,
+                 timeout_faixa=TIMEOUT_FAIXA, max_faixas_por_trabalhador=MAX_FAIXAS_POR_TRABALHADOR,
+                 porta_metricas=PORT_METRICAS):
+        self.host = host
+        self.port = port
+        self.porta_metricas = porta_metricas # None desliga o endpoint de métricas.
+        self.timeout_heartbeat = timeout_heartbeat
+        self.timeout_faixa = timeout_faixa
+        self.tamanho_grao = tamanho_grao
+        self.grao_adaptativo = grao_adaptativo
+        self.tempo_alvo_faixa = tempo_alvo_faixa
+        self.max_faixas_por_trabalhador = max_faixas_por_trabalhador
+        self.trabalhadores = []
+        self.trabalho = None # Intervalo sendo distribuído no momento.
+        self.faixas = {} # id -> lease de uma faixa entregue e ainda não concluída
+        self.proximo_id = 0
+        self.pool_alterado = None # asyncio.Condition sinalizada a cada entrada no pool.
+        self.loop = None
+        self.servidor = None
+        self.servidor_metricas = None
+        self.monitor = None
+
+    # Executa uma corrotina no event loop do coordenador e aguarda o resultado.
+    def executar(self, corrotina):
+        return asyncio.run_coroutine_threadsafe(corrotina, self.loop).result()
+
+    # Inicia o event loop em segundo plano e abre o socket de escuta.
+    def iniciar(self):
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.executar(self.iniciar_async())
+
+    async def iniciar_async(self):
+        self.pool_alterado = asyncio.Condition()
+        self.servidor = await asyncio.start_server(self.atender_cliente, self.host, self.port,
+                                                   reuse_address=True, backlog=BACKLOG_CONEXOES)
+        self.monitor = asyncio.create_task(self.monitorar_heartbeats())
+        print(f"Coordenador ouvindo em {self.host}:{self.port}")
+        if self.porta_metricas is not None:
+            self.servidor_metricas = await asyncio.start_server(
+                lambda reader, writer: atender_consulta(self, reader, writer),
+                self.host, self.porta_metricas, reuse_address=True)
+            print(f"Métricas em http://{self.host}:{self.porta_metricas}/metrics")
 
-        # Inicialização de threads.
-        threads = []
+    # Atende um cliente: exige o REGISTRO e lê as mensagens até a conexão cair.
+    # Cada mensagem é tratada antes de ler a próxima, então um cliente que envia
+    # mais rápido do que o coordenador agrega é contido pelo próprio TCP.
+    async def atender_cliente(self, reader, writer):
+        addr = writer.get_extra_info('peername')
+        try:
+            tipo, corpo = await asyncio.wait_for(receber_mensagem_async(reader), self.timeout_heartbeat)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            writer.close()
+            return
+        if tipo != REGISTRO:
+            writer.close()
+            return
 
-        # Iteração para cada cliente conectado.
-        for i, (conn, addr) in enumerate(clients):
-            faixa_inicio = inicio + (i * step)
+        trabalhador = Trabalhador(reader, writer, addr, decodificar_registro(corpo))
+        self.trabalhadores.append(trabalhador)
+        print(f"Cliente conectado: {addr} ({trabalhador.nucleos} núcleo(s))")
+        async with self.pool_alterado:
+            self.pool_alterado.notify_all()
 
-            if i == num_clients - 1:
-                faixa_fim = fim
+        try:
+            while True:
+                tipo, corpo = await receber_mensagem_async(reader)
+                trabalhador.ultimo_contato = time.time()
+
+                if tipo == HEARTBEAT:
+                    continue
+                elif tipo == PEDIDO:
+                    trabalhador.pedidos += 1
+                    self.despachar(trabalhador)
+                elif tipo == PARCIAL:
+                    # Agrega o resultado parcial assim que ele chega. Resultados de
+                    # leases já expirados ou concluídos são descartados.
+                    with medir('servidor.agregacao'):
+                        id_faixa, sub_inicio, sub_fim, perfeitos, pares, pendentes = decodificar_parcial(corpo)
+                        faixa = self.faixas.get(id_faixa)
+                        if faixa is None:
+                            contar('parciais_descartados')
+                        else:
+                            # O resultado parcial também é o progresso do cliente na faixa
+                            processados = sub_fim - sub_inicio + 1
+                            faixa['processados'] += processados
+                            trabalhador.numeros_processados += processados
+                            trabalho = faixa['trabalho']
+                            trabalho.numeros_processados += processados
+                            trabalho.numeros_perfeitos.update(perfeitos)
+                            trabalho.pares_amigaveis.update(pares)
+                            trabalho.ligacoes_pendentes.update(pendentes)
+                            # Cada subfaixa já é um resultado completo e vai direto ao checkpoint.
+                            if trabalho.registro:
+                                trabalho.registro.registrar(sub_inicio, sub_fim, perfeitos, pares)
+                elif tipo == FIM:
+                    id_faixa, tempo_cliente, tempos_nucleos = decodificar_fim(corpo)
+                    self.concluir_faixa(trabalhador, id_faixa, tempo_cliente, tempos_nucleos)
+                    # A vaga liberada pode ser ocupada por um pedido já recebido.
+                    self.despachar(trabalhador)
+                else:
+                    raise ConnectionError(f"Mensagem inesperada do cliente {addr}: tipo {tipo}")
+
+                # Respeita o buffer de envio do cliente antes de ler mais mensagens.
+                await writer.drain()
+        except (OSError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.remover_trabalhador(trabalhador)
+
+    # Tamanho da próxima faixa de um cliente, a partir da vazão medida dele.
+    def calcular_grao(self, trabalhador, restante):
+        grao = self.tamanho_grao
+        if self.grao_adaptativo and trabalhador.vazao:
+            grao = int(trabalhador.vazao * self.tempo_alvo_faixa)
+        # Perto do fim, faixas menores evitam que um único cliente segure os demais;
+        # o restante é repartido na proporção dos núcleos de cada cliente.
+        total_nucleos = sum(t.nucleos for t in self.trabalhadores)
+        grao = min(grao, max(TAMANHO_GRAO_MINIMO, restante * trabalhador.nucleos // max(1, total_nucleos)))
+        return max(1, grao)
+
+    # Entrega faixas do trabalho atual a um cliente enquanto houver pedidos dele
+    # e vaga no seu limite de faixas em andamento: primeiro as faixas perdidas por
+    # outros clientes, depois as ainda não distribuídas.
+    def despachar(self, trabalhador):
+        trabalho = self.trabalho
+        while (trabalho is not None and trabalhador.pedidos > 0
+               and len(trabalhador.faixas) < self.max_faixas_por_trabalhador):
+            if trabalho.reenvios:
+                faixa_inicio, faixa_fim = trabalho.reenvios.pop()
+            elif trabalho.lacunas:
+                faixa_inicio, faixa_fim = trabalho.retirar(self.calcular_grao(trabalhador, trabalho.restante()))
+            else:
+                return
+
+            # Prazo do lease proporcional ao tempo esperado para este cliente,
+            # contando as faixas que ele processa antes desta.
+            tamanho = faixa_fim - faixa_inicio + 1
+            prazo = self.timeout_faixa
+            if trabalhador.vazao:
+                prazo = max(prazo, FATOR_PRAZO_FAIXA * tamanho * (len(trabalhador.faixas) + 1) / trabalhador.vazao)
+
+            id_faixa = self.proximo_id
+            self.proximo_id += 1
+            self.faixas[id_faixa] = {
+                'trabalho': trabalho,
+                'inicio': faixa_inicio,
+                'fim': faixa_fim,
+                'trabalhador': trabalhador,
+                'expira_em': time.time() + prazo,
+                'processados': 0 # Números das subfaixas já recebidas deste lease
+            }
+            trabalho.em_andamento += 1
+            trabalho.faixas += 1
+            trabalhador.pedidos -= 1
+            trabalhador.faixas.add(id_faixa)
+
+            # O fim global acompanha a faixa para que cada par amigável seja
+            # encontrado apenas pelo cliente que contém o seu menor elemento; o
+            # início global, para que os pares com o menor elemento abaixo dele
+            # sejam encontrados pelo cliente que contém o maior.
+            trabalhador.enviar(INTERVALO, codificar_intervalo(id_faixa, faixa_inicio, faixa_fim, trabalho.fim,
+                                                              trabalho.pares_abaixo_de))
+
+    # Registra a conclusão de uma faixa, atualiza a vazão do cliente e acumula
+    # o tempo ocupado de cada um dos seus núcleos.
+    def concluir_faixa(self, trabalhador, id_faixa, tempo_cliente, tempos_nucleos=()):
+        trabalhador.faixas.discard(id_faixa)
+        faixa = self.faixas.pop(id_faixa, None)
+        if faixa is None:
+            return
+
+        trabalhador.faixas_concluidas += 1
+        tamanho = faixa['fim'] - faixa['inicio'] + 1
+        if tempo_cliente > 0:
+            vazao = tamanho / tempo_cliente
+            # Média móvel para suavizar variações entre faixas.
+            trabalhador.vazao = vazao if trabalhador.vazao is None else (trabalhador.vazao + vazao) / 2
+
+        acumulado = faixa['trabalho'].tempos_nucleos.setdefault(trabalhador.addr, [])
+        for i, tempo_nucleo in enumerate(tempos_nucleos):
+            if i < len(acumulado):
+                acumulado[i] += tempo_nucleo
             else:
-                faixa_fim = faixa_inicio + step - 1
+                acumulado.append(tempo_nucleo)
+
+        faixa['trabalho'].em_andamento -= 1
+        self.verificar_conclusao(faixa['trabalho'])
+
+    def verificar_conclusao(self, trabalho):
+        if trabalho.completo():
+            trabalho.concluido.set()
+
+    # Devolve uma faixa perdida (cliente caiu ou lease expirou) para a fila do
+    # trabalho e a entrega imediatamente a algum cliente ocioso.
+    def reenfileirar_faixa(self, id_faixa):
+        faixa = self.faixas.pop(id_faixa, None)
+        if faixa is None:
+            return
+
+        faixa['trabalhador'].faixas.discard(id_faixa)
+        trabalho = faixa['trabalho']
+        trabalho.em_andamento -= 1
+        # A faixa volta inteira, então o progresso parcial dela é desfeito.
+        trabalho.numeros_processados -= faixa['processados']
+        trabalho.reenvios.append((faixa['inicio'], faixa['fim']))
+        trabalho.faixas_reenviadas += 1
+        print(f"Faixa {faixa['inicio']}-{faixa['fim']} será redistribuída")
 
-            # Para cada função de controle de cliente, atribuir um thread.
-            t = threading.Thread(target=handle_client, args=(conn, addr, (faixa_inicio, faixa_fim)))
-            t.start() # Inicia a thread
-            threads.append(t) # Adição da thread na lista de threads.
+        for trabalhador in self.trabalhadores:
+            self.despachar(trabalhador)
 
-        # Aguarda todos os clientes (todas as threads) terminarem o processo
-        for t in threads:
-            t.join()
+    # Fecha as conexões de clientes que pararam de enviar heartbeats e
+    # redistribui as faixas cujo lease expirou.
+    async def monitorar_heartbeats(self):
+        while True:
+            await asyncio.sleep(1.0)
+            agora = time.time()
+            for id_faixa in [i for i, f in self.faixas.items() if f['expira_em'] < agora]:
+                print(f"Lease da faixa {id_faixa} expirou")
+                self.reenfileirar_faixa(id_faixa)
+
+            limite = agora - self.timeout_heartbeat
+            for trabalhador in [t for t in self.trabalhadores if t.ultimo_contato < limite]:
+                print(f"Cliente {trabalhador.addr} sem heartbeat há mais de {self.timeout_heartbeat} segundos")
+                # Derruba a conexão; a leitura pendente falha e remove o cliente do pool.
+                trabalhador.writer.transport.abort()
+
+    def remover_trabalhador(self, trabalhador):
+        if trabalhador not in self.trabalhadores:
+            return
+        self.trabalhadores.remove(trabalhador)
+        # As faixas em andamento neste cliente são entregues a outros.
+        for id_faixa in list(trabalhador.faixas):
+            self.reenfileirar_faixa(id_faixa)
+        trabalhador.writer.close()
+        print(f"Cliente desconectado: {trabalhador.addr}")
+
+    # Bloqueia até haver pelo menos num_clients clientes registrados no pool.
+    def aguardar_trabalhadores(self, num_clients):
+        print(f"\nAguardando conexão de {num_clients} clientes em {self.host}:{self.port}...")
+        self.executar(self.aguardar_trabalhadores_async(num_clients))
+
+    async def aguardar_trabalhadores_async(self, num_clients):
+        async with self.pool_alterado:
+            await self.pool_alterado.wait_for(lambda: len(self.trabalhadores) >= num_clients)
+
+    # Distribui um intervalo sob demanda entre os clientes do pool e agrega os resultados.
+    # Com checkpoint (caminho de arquivo), as subfaixas concluídas são gravadas à
+    # medida que chegam e, se o arquivo já existir, só o que falta é distribuído.
+    # pares_abaixo_de (por padrão, o próprio inicio) inclui os pares cujo menor
+    # elemento fica abaixo dele e o maior em [inicio, fim].
+    def executar_distribuicao(self, inicio, fim, checkpoint=None, pares_abaixo_de=None):
+        print(f"Distribuindo intervalo: {inicio} a {fim}")
+        print("Iniciando distribuição de intervalos.")
+        # Marcar início do tempo de execução
+        tempo_inicio = time.time()
+
+        if checkpoint is None:
+            num_clients, num_nucleos, trabalho = self.executar(
+                self.distribuir(inicio, fim, pares_abaixo_de=pares_abaixo_de))
+        else:
+            with Checkpoint(checkpoint, fim) as registro:
+                num_clients, num_nucleos, trabalho = self.executar(
+                    self.distribuir(inicio, fim, registro, pares_abaixo_de))
 
         # Marcar fim do tempo de execução
         tempo_fim = time.time()
         tempo_execucao = tempo_fim - tempo_inicio
 
-        # Array para armazenar resultados.
-        numeros_perfeitos = []
-        pares_amigaveis = []
-
-        # Adicionar resultados no array de números perfeitos/amigáveis.
-        for res in results:
-            numeros_perfeitos.extend(res['numeros_perfeitos'])
-            pares_amigaveis.extend(res['pares_amigaveis'])
+        # Os resultados já foram agregados à medida que chegaram.
+        numeros_perfeitos = sorted(trabalho.numeros_perfeitos)
+        pares_amigaveis = sorted(trabalho.pares_amigaveis)
 
         print("\n=== RESULTADOS AGREGADOS ===")
         print(f"Tempo de execução: {tempo_execucao:.4f} segundos")
-        print("Números perfeitos encontrados:", sorted(set(numeros_perfeitos)))
-        print("Pares amigáveis encontrados:", sorted(set(map(tuple, map(sorted, pares_amigaveis)))))
+        print(f"Faixas distribuídas: {trabalho.faixas}")
+        if trabalho.faixas_reenviadas:
+            print(f"Faixas redistribuídas após falha ou timeout: {trabalho.faixas_reenviadas}")
+        for addr, tempos in trabalho.tempos_nucleos.items():
+            print(f"Tempo por núcleo de {addr}: {', '.join(f'{t:.3f}' for t in tempos)} segundos")
+        print("Números perfeitos encontrados:", numeros_perfeitos)
+        print("Pares amigáveis encontrados:", pares_amigaveis)
 
         return {
             'intervalo': f"{inicio}-{fim}",
             'quantidade_clientes': num_clients,
-            'tempo_execucao': tempo_execucao
+            'quantidade_nucleos': num_nucleos,
+            'tempo_execucao': tempo_execucao,
+            'numeros_perfeitos': numeros_perfeitos,
+            'pares_amigaveis': pares_amigaveis,
+            'ligacoes_pendentes': sorted(trabalho.ligacoes_pendentes)
         }
 
+    async def distribuir(self, inicio, fim, registro=None, pares_abaixo_de=None):
+        num_clients = len(self.trabalhadores)
+        num_nucleos = sum(t.nucleos for t in self.trabalhadores)
+        trabalho = Trabalho(inicio, fim, registro, pares_abaixo_de)
+        self.trabalho = trabalho
+
+        # Clientes que já estavam esperando recebem as primeiras faixas agora;
+        # os demais recebem ao pedir.
+        for trabalhador in list(self.trabalhadores):
+            self.despachar(trabalhador)
+        self.verificar_conclusao(trabalho)
+
+        with medir('servidor.distribuicao'):
+            await trabalho.concluido.wait()
+        self.trabalho = None
+        return num_clients, num_nucleos, trabalho
+
+    # Libera os clientes, fecha o socket de escuta e para o event loop.
+    def encerrar(self):
+        self.executar(self.encerrar_async())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    async def encerrar_async(self):
+        self.monitor.cancel()
+        self.servidor.close()
+        if self.servidor_metricas is not None:
+            self.servidor_metricas.close()
+        for trabalhador in list(self.trabalhadores):
+            trabalhador.enviar(ENCERRAR)
+            try:
+                await trabalhador.writer.drain()
+            except (OSError, ConnectionError):
+                pass
+            trabalhador.writer.close()
+
+# Distribuição incremental de [inicio, fim]: cada estender(novo_fim) distribui
+# apenas a parte nova (fim + 1 a novo_fim), com os parceiros até novo_fim. Os
+# pares com o menor elemento já processado e o maior na parte nova vêm das
+# ligações pendentes (n, s(n)) enviadas pelos clientes, confirmadas aqui pela
+# fatoração de s(n) quando ele entra no intervalo. Os pares com o menor elemento
+# abaixo de inicio são confirmados pelos clientes que têm o maior elemento.
+class DistribuicaoIncremental:
+    def __init__(self, coordenador, inicio=1):
+        self.coordenador = coordenador
+        self.inicio = max(inicio, 1)
+        self.fim = self.inicio - 1
+        self.numeros_perfeitos = set()
+        self.pares_amigaveis = set()
+        self.pendentes = [] # Ligações (n, s(n)) com s(n) > fim
+        self.tempo_acumulado = 0.0
+
+    # 'tempo_execucao' é o tempo desta extensão; 'tempo_acumulado', o de todas até aqui.
+    def estender(self, novo_fim):
+        if novo_fim < self.fim:
+            raise ValueError(f"O intervalo só pode ser estendido (fim atual: {self.fim})")
+        tempo_inicio = time.time()
+
+        resultado = self.coordenador.executar_distribuicao(self.fim + 1, novo_fim, pares_abaixo_de=self.inicio)
+        self.numeros_perfeitos.update(resultado['numeros_perfeitos'])
+        self.pares_amigaveis.update(resultado['pares_amigaveis'])
+
+        # Ligações antigas cujo parceiro entrou no intervalo
+        primos = gerar_primos(math.isqrt(novo_fim))
+        ainda_pendentes = resultado['ligacoes_pendentes']
+        for n, soma_n in self.pendentes:
+            if soma_n > novo_fim:
+                ainda_pendentes.append((n, soma_n))
+            elif calcular_soma_divisores_primos(soma_n, primos) == n:
+                self.pares_amigaveis.add((n, soma_n))
+        self.pendentes = ainda_pendentes
+        self.fim = novo_fim
+
+        tempo_execucao = time.time() - tempo_inicio
+        self.tempo_acumulado += tempo_execucao
+        print(f"Total acumulado em {self.inicio}-{self.fim}: {len(self.numeros_perfeitos)} perfeito(s), "
+              f"{len(self.pares_amigaveis)} par(es) amigável(is) em {self.tempo_acumulado:.4f} segundos")
+
+        return {
+            'intervalo': f"{self.inicio}-{self.fim}",
+            'quantidade_clientes': resultado['quantidade_clientes'],
+            'quantidade_nucleos': resultado['quantidade_nucleos'],
+            'tempo_execucao': tempo_execucao,
+            'tempo_acumulado': self.tempo_acumulado,
+            'numeros_perfeitos': sorted(self.numeros_perfeitos),
+            'pares_amigaveis': sorted(self.pares_amigaveis)
+        }
+
+# Função que organiza a distribuição e agregação de resultados para um intervalo.
+# Sem um coordenador já iniciado, cria um temporário só para este intervalo.
+def executar_distribuicao(inicio, fim, num_clients, coordenador=None, checkpoint=None):
+    if coordenador is not None:
+        coordenador.aguardar_trabalhadores(num_clients)
+        return coordenador.executar_distribuicao(inicio, fim, checkpoint)
+
+    coordenador = Coordenador()
+    coordenador.iniciar()
+    try:
+        coordenador.aguardar_trabalhadores(num_clients)
+        return coordenador.executar_distribuicao(inicio, fim, checkpoint)
+    finally:
+        coordenador.encerrar()
+
 def salvar_csv(resultados, nome_arquivo=None):
     """Salva os resultados em um arquivo CSV"""
     if nome_arquivo is None:
@@ -124,21 +532,22 @@ def main():
     # Lista para armazenar todos os resultados
     todos_resultados = []
 
-    # Executar a função com 3 intervalos diferentes
-    resultado1 = executar_distribuicao(1, 100000, num_clients)
-    todos_resultados.append(resultado1)
+    # Os clientes se conectam uma única vez e atendem a todos os intervalos.
+    coordenador = Coordenador()
+    coordenador.iniciar()
 
-    resultado2 = executar_distribuicao(1, 250000, num_clients)
-    todos_resultados.append(resultado2)
-    
-    resultado3 = executar_distribuicao(1, 500000, num_clients)
-    todos_resultados.append(resultado3)
-    
-    resultado4 = executar_distribuicao(1, 750000, num_clients)
-    todos_resultados.append(resultado4)
+    try:
+        coordenador.aguardar_trabalhadores(num_clients)
 
-    resultado5 = executar_distribuicao(1, 1000000, num_clients)
-    todos_resultados.append(resultado5)
+        # Cada intervalo estende o anterior: só a parte nova é distribuída
+        distribuicao = DistribuicaoIncremental(coordenador)
+        for fim in (100000, 250000, 500000, 750000, 1000000):
+            resultado = distribuicao.estender(fim)
+            # No CSV, o tempo de um intervalo é o total até obter o seu resultado
+            resultado['tempo_execucao'] = resultado['tempo_acumulado']
+            todos_resultados.append(resultado)
+    finally:
+        coordenador.encerrar()
     
     # Salvar resultados em CSV
     salvar_csv(todos_resultados)
@@ -0,0 +1,93 @@
+import mmap
+import os
+from array import array
+from typing import Callable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Sem fcntl (Windows), o crescimento não é protegido entre processos
+    fcntl = None
+
+try:
+    import numpy as np
+except ImportError:  # Backend NumPy é opcional
+    np = None
+
+# Armazenamento persistente das somas de divisores próprios s(n).
+# O arquivo é um array de inteiros de 64 bits indexado por n (a posição 0 guarda
+# s(0) = 0), sem cabeçalho: o tamanho do arquivo diz até onde a tabela vai.
+# A leitura é feita por mmap, sem cópia; quando um limite maior é pedido, apenas
+# os números que faltam são calculados e acrescentados ao fim do arquivo.
+TAMANHO_ITEM = 8
+
+# Quantidade de números calculados e gravados de cada vez ao crescer a tabela.
+TAMANHO_JANELA_CRESCIMENTO = 1 << 20
+
+class ArmazenamentoSomas:
+    # calcular_segmento(inicio, fim) devolve [s(inicio), ..., s(fim)], com inicio >= 1.
+    def __init__(self, caminho: str, calcular_segmento: Callable[[int, int], List[int]]):
+        self.caminho = caminho
+        self.calcular_segmento = calcular_segmento
+        self.mapa = None
+        self.somas = memoryview(b'').cast('q') # Visão sem cópia do mapa atual.
+
+        with open(caminho, 'ab'):
+            pass # Cria o arquivo se ainda não existir.
+        self.mapear()
+
+    # Maior n com s(n) já armazenado (-1 para tabela vazia).
+    @property
+    def limite(self) -> int:
+        return len(self.somas) - 1
+
+    # Remapeia o arquivo após crescer. Um item incompleto no fim (gravação
+    # interrompida) é ignorado e será recalculado no próximo crescimento.
+    def mapear(self):
+        tamanho = os.path.getsize(self.caminho)
+        tamanho -= tamanho % TAMANHO_ITEM
+        if tamanho == 0:
+            self.mapa = None
+            self.somas = memoryview(b'').cast('q')
+            return
+        with open(self.caminho, 'rb') as arquivo:
+            # O mapa antigo é liberado quando não houver mais visões dele em uso.
+            self.mapa = mmap.mmap(arquivo.fileno(), tamanho, access=mmap.ACCESS_READ)
+        self.somas = memoryview(self.mapa).cast('q')
+
+    # Garante que a tabela cobre 0..limite, calculando e gravando só o que falta.
+    def garantir(self, limite: int):
+        if limite <= self.limite:
+            return
+
+        with open(self.caminho, 'r+b') as arquivo:
+            if fcntl is not None:
+                fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX)
+            # Outro processo pode ter crescido a tabela enquanto esperávamos.
+            tamanho = os.fstat(arquivo.fileno()).st_size
+            coberto = tamanho // TAMANHO_ITEM - 1
+            arquivo.truncate((coberto + 1) * TAMANHO_ITEM)
+            arquivo.seek(0, os.SEEK_END)
+
+            if coberto < 0:
+                arquivo.write(array('q', [0]).tobytes())
+                coberto = 0
+            for inicio in range(coberto + 1, limite + 1, TAMANHO_JANELA_CRESCIMENTO):
+                fim = min(inicio + TAMANHO_JANELA_CRESCIMENTO - 1, limite)
+                arquivo.write(array('q', self.calcular_segmento(inicio, fim)).tobytes())
+            arquivo.flush()
+
+        self.mapear()
+
+    # Tabela s(0..limite) sem cópia: memoryview de inteiros, ou array NumPy
+    # int64 (também sobre o mesmo mapa) com como_numpy=True.
+    def tabela(self, limite: int, como_numpy: bool = False):
+        self.garantir(limite)
+        if como_numpy:
+            return np.frombuffer(self.mapa, dtype=np.int64, count=limite + 1)
+        return self.somas[:limite + 1]
+
+    # s(n) se n já estiver armazenado; None caso contrário.
+    def obter(self, n: int) -> Optional[int]:
+        if 0 <= n < len(self.somas):
+            return self.somas[n]
+        return None
@@ -0,0 +1,88 @@
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Cache das somas de divisores próprios s(n) compartilhado por todas as chamadas
+# do processo (verificações avulsas, pares, chunks de verificação). Os números
+# pequenos, que costumam ser consultados em faixas contíguas, ficam em um array
+# denso indexado por n; os maiores, esparsos, em um LRU de capacidade fixa.
+# A memória é limitada pelos dois parâmetros: 8 bytes por número do array
+# (que cresce sob demanda até limite_denso) e capacidade_lru entradas no LRU.
+# As threads do verificador paralelo compartilham o mesmo cache: o LRU e o
+# crescimento do array denso ficam sob um lock; leituras e escritas de uma
+# posição do array já existente são atômicas sob o GIL e dispensam o lock
+# (nesse caminho, as estatísticas podem perder alguma contagem concorrente).
+LIMITE_DENSO_PADRAO = 1 << 20
+CAPACIDADE_LRU_PADRAO = 1 << 16
+
+# Posição do array denso ainda não calculada (s(n) >= 0 para todo n).
+AUSENTE = -1
+
+# Crescimento mínimo do array denso, em números.
+CRESCIMENTO_MINIMO_DENSO = 1 << 12
+
+class CacheSomas:
+    def __init__(self, limite_denso: int = LIMITE_DENSO_PADRAO, capacidade_lru: int = CAPACIDADE_LRU_PADRAO):
+        self.limite_denso = max(0, limite_denso)
+        self.capacidade_lru = max(0, capacidade_lru)
+        self.lock = threading.Lock()
+        self.limpar()
+
+    def limpar(self):
+        with self.lock:
+            self.densos = array('q')
+            self.lru = OrderedDict()
+            self.acertos = 0
+            self.faltas = 0
+            self.descartes = 0
+
+    # s(n) se estiver no cache, senão None (e a consulta conta como falta).
+    def obter(self, n: int) -> Optional[int]:
+        if n <= self.limite_denso:
+            densos = self.densos
+            if 0 <= n < len(densos) and densos[n] != AUSENTE:
+                self.acertos += 1
+                return densos[n]
+            self.faltas += 1
+            return None
+        with self.lock:
+            soma = self.lru.get(n)
+            if soma is None:
+                self.faltas += 1
+                return None
+            self.lru.move_to_end(n)
+            self.acertos += 1
+            return soma
+
+    def guardar(self, n: int, soma: int):
+        if n <= self.limite_denso:
+            if n >= len(self.densos):
+                with self.lock:
+                    if n >= len(self.densos):
+                        # Cresce em blocos (dobrando) para não realocar a cada número novo
+                        novo_tamanho = min(self.limite_denso + 1,
+                                           max(n + 1, 2 * len(self.densos), CRESCIMENTO_MINIMO_DENSO))
+                        self.densos.extend(array('q', [AUSENTE]) * (novo_tamanho - len(self.densos)))
+            self.densos[n] = soma
+            return
+        with self.lock:
+            if self.capacidade_lru:
+                self.lru[n] = soma
+                self.lru.move_to_end(n)
+                if len(self.lru) > self.capacidade_lru:
+                    self.lru.popitem(last=False)
+                    self.descartes += 1
+
+    def estatisticas(self) -> Dict:
+        with self.lock:
+            consultas = self.acertos + self.faltas
+            return {
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'taxa_acertos': self.acertos / consultas if consultas else 0.0,
+                'descartes': self.descartes,
+                'itens_densos': len(self.densos),
+                'itens_lru': len(self.lru),
+                'bytes_densos': len(self.densos) * self.densos.itemsize,
+            }
@@ -0,0 +1,157 @@
+import os
+import struct
+import time
+from typing import List, Tuple
+
+# Checkpoint de varreduras longas: registra em disco as subfaixas já concluídas
+# e os perfeitos/pares encontrados nelas, para que uma varredura interrompida
+# seja retomada processando apenas as subfaixas que faltam.
+#
+# Formato do arquivo (inteiros big-endian sem sinal):
+#   cabeçalho: assinatura, versão e limite_parceiros da varredura;
+#   registros: (inicio, fim, qtd. de perfeitos, qtd. de pares) seguidos dos
+#              perfeitos e dos pares achatados, um registro por subfaixa.
+# Cada par pertence à subfaixa do seu menor elemento, com o parceiro até
+# limite_parceiros; por isso o limite faz parte do cabeçalho e um checkpoint só
+# é reaproveitado por varreduras com o mesmo limite. Pares que cruzam o início
+# de uma varredura (menor elemento fora dela) pertencem à subfaixa do maior.
+ASSINATURA = b'POFC'
+VERSAO = 1
+FORMATO_CABECALHO = struct.Struct('!4sBQ')
+FORMATO_REGISTRO = struct.Struct('!QQII')
+
+# Intervalo mínimo (em segundos) entre duas sincronizações (fsync) do arquivo.
+INTERVALO_SINCRONIZACAO = 5.0
+
+# Checkpoint aberto para uma varredura. Ao abrir um arquivo existente, os
+# registros válidos são carregados (um registro truncado por uma interrupção é
+# descartado) e o arquivo é compactado em um registro por trecho contínuo.
+class Checkpoint:
+    def __init__(self, caminho: str, limite_parceiros: int, intervalo_sincronizacao: float = INTERVALO_SINCRONIZACAO):
+        self.caminho = caminho
+        self.limite_parceiros = limite_parceiros
+        self.intervalo_sincronizacao = intervalo_sincronizacao
+        self.concluidas = [] # Trechos concluídos, ordenados e sem sobreposição.
+        self.numeros_perfeitos = set()
+        self.pares_amigaveis = set()
+        self.ultima_sincronizacao = time.time()
+
+        if os.path.exists(caminho):
+            self.carregar()
+        self.compactar()
+        self.arquivo = open(caminho, 'ab')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+    def carregar(self):
+        with open(self.caminho, 'rb') as arquivo:
+            dados = arquivo.read()
+
+        if len(dados) < FORMATO_CABECALHO.size:
+            return
+        assinatura, versao, limite_parceiros = FORMATO_CABECALHO.unpack_from(dados)
+        if assinatura != ASSINATURA or versao != VERSAO:
+            raise ValueError(f"{self.caminho} não é um arquivo de checkpoint válido")
+        if limite_parceiros != self.limite_parceiros:
+            raise ValueError(f"Checkpoint {self.caminho} pertence a uma varredura com limite_parceiros="
+                             f"{limite_parceiros}, não {self.limite_parceiros}")
+
+        posicao = FORMATO_CABECALHO.size
+        while posicao + FORMATO_REGISTRO.size <= len(dados):
+            inicio, fim, qtd_perfeitos, qtd_pares = FORMATO_REGISTRO.unpack_from(dados, posicao)
+            tamanho_valores = 8 * (qtd_perfeitos + 2 * qtd_pares)
+            fim_registro = posicao + FORMATO_REGISTRO.size + tamanho_valores
+            if fim_registro > len(dados):
+                break # Registro incompleto: a subfaixa será processada de novo.
+            valores = struct.unpack_from(f'!{qtd_perfeitos + 2 * qtd_pares}Q', dados, posicao + FORMATO_REGISTRO.size)
+            self.adicionar(inicio, fim, valores[:qtd_perfeitos],
+                           zip(valores[qtd_perfeitos::2], valores[qtd_perfeitos + 1::2]))
+            posicao = fim_registro
+
+    # Incorpora uma subfaixa concluída ao estado em memória.
+    def adicionar(self, inicio: int, fim: int, perfeitos, pares):
+        self.numeros_perfeitos.update(perfeitos)
+        self.pares_amigaveis.update(pares)
+
+        concluidas = []
+        for trecho_inicio, trecho_fim in self.concluidas:
+            if trecho_fim + 1 < inicio or fim + 1 < trecho_inicio:
+                concluidas.append((trecho_inicio, trecho_fim))
+            else:
+                inicio, fim = min(inicio, trecho_inicio), max(fim, trecho_fim)
+        concluidas.append((inicio, fim))
+        self.concluidas = sorted(concluidas)
+
+    # Reescreve o arquivo com um registro por trecho contínuo concluído. A troca
+    # por os.replace garante que o arquivo antigo só some quando o novo está completo.
+    def compactar(self):
+        temporario = self.caminho + '.tmp'
+        with open(temporario, 'wb') as arquivo:
+            arquivo.write(FORMATO_CABECALHO.pack(ASSINATURA, VERSAO, self.limite_parceiros))
+            for inicio, fim in self.concluidas:
+                perfeitos = sorted(n for n in self.numeros_perfeitos if inicio <= n <= fim)
+                pares = sorted(par for par in self.pares_amigaveis
+                               if inicio <= par[0] <= fim or
+                               (inicio <= par[1] <= fim and not self.concluido(par[0])))
+                arquivo.write(codificar_registro(inicio, fim, perfeitos, pares))
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, self.caminho)
+
+    # Grava uma subfaixa concluída. O registro vai para o arquivo imediatamente;
+    # a sincronização com o disco é feita no máximo a cada intervalo_sincronizacao.
+    def registrar(self, inicio: int, fim: int, perfeitos: List[int], pares: List[Tuple[int, int]]):
+        self.adicionar(inicio, fim, perfeitos, pares)
+        self.arquivo.write(codificar_registro(inicio, fim, perfeitos, pares))
+        self.arquivo.flush()
+        if time.time() - self.ultima_sincronizacao >= self.intervalo_sincronizacao:
+            os.fsync(self.arquivo.fileno())
+            self.ultima_sincronizacao = time.time()
+
+    def concluido(self, n: int) -> bool:
+        return any(inicio <= n <= fim for inicio, fim in self.concluidas)
+
+    # Trechos de [inicio, fim] que ainda não foram concluídos, em ordem crescente.
+    def faixas_pendentes(self, inicio: int, fim: int) -> List[Tuple[int, int]]:
+        pendentes = []
+        cursor = inicio
+        for trecho_inicio, trecho_fim in self.concluidas:
+            if trecho_fim < cursor:
+                continue
+            if trecho_inicio > fim:
+                break
+            if trecho_inicio > cursor:
+                pendentes.append((cursor, trecho_inicio - 1))
+            cursor = trecho_fim + 1
+        if cursor <= fim:
+            pendentes.append((cursor, fim))
+        return pendentes
+
+    # Perfeitos e pares já encontrados em [inicio, fim] (pares pelo menor elemento).
+    def resultados(self, inicio: int, fim: int) -> Tuple[List[int], List[Tuple[int, int]]]:
+        perfeitos = sorted(n for n in self.numeros_perfeitos if inicio <= n <= fim)
+        pares = sorted(par for par in self.pares_amigaveis if inicio <= par[0] <= fim)
+        return perfeitos, pares
+
+    # Pares com o menor elemento abaixo de inicio e o maior em [inicio, fim],
+    # registrados pelas varreduras que começaram acima do menor elemento.
+    def pares_cruzados(self, inicio: int, fim: int) -> List[Tuple[int, int]]:
+        return sorted(par for par in self.pares_amigaveis if par[0] < inicio <= par[1] <= fim)
+
+    def fechar(self):
+        if self.arquivo.closed:
+            return
+        self.arquivo.flush()
+        os.fsync(self.arquivo.fileno())
+        self.arquivo.close()
+
+def codificar_registro(inicio: int, fim: int, perfeitos: List[int], pares: List[Tuple[int, int]]) -> bytes:
+    valores = list(perfeitos)
+    for a, b in pares:
+        valores.extend((a, b))
+    return (FORMATO_REGISTRO.pack(inicio, fim, len(perfeitos), len(pares)) +
+            struct.pack(f'!{len(valores)}Q', *valores))
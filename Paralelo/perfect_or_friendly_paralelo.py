@@ -1,82 +1,438 @@
 import math
-from typing import List, Tuple, Set, Dict
+from typing import List, Tuple, Set, Dict, Optional
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from array import array
 from threading import Thread
 import time 
 import queue
 import csv
+import os
+import sys
+from checkpoint import Checkpoint
+from armazenamento_somas import ArmazenamentoSomas
+from fatoracao import soma_divisores_fatoracao, eh_primo
+from cache_somas import CacheSomas, LIMITE_DENSO_PADRAO, CAPACIDADE_LRU_PADRAO
+from instrumentacao import medir, contar
+
+try:
+    import numpy as np
+except ImportError:  # Backend NumPy é opcional
+    np = None
 
 
 def calcular_soma_divisores(n: int) -> int:
+    contar('chamadas_soma_divisores')
+    if cache_somas is not None:
+        soma = cache_somas.obter(n)
+        if soma is not None:
+            return soma
+    # Consulta o armazenamento persistente, se o número já estiver nele
+    if armazenamento is not None:
+        soma = armazenamento.obter(n)
+        if soma is not None:
+            return soma
+    
     if n <= 1:
         return 0
+    if n > LIMITE_DIVISAO_TENTATIVA:
+        # Números grandes: sigma(n) a partir da fatoração, em milissegundos
+        # mesmo para 64 bits ou mais
+        soma = soma_divisores_fatoracao(n)
+    else:
+        soma = 1  # 1 é sempre divisor próprio
+        
+        # Itera apenas até a raiz quadrada
+        for i in range(2, int(math.sqrt(n)) + 1):
+            if n % i == 0:
+                soma += i
+                # Adiciona o divisor correspondente, evitando duplicatas
+                if i != n // i:
+                    soma += n // i
     
-    soma = 1  # 1 é sempre divisor próprio
-    
-    # Itera apenas até a raiz quadrada
-    for i in range(2, int(math.sqrt(n)) + 1):
-        if n % i == 0:
-            soma += i
-            # Adiciona o divisor correspondente, evitando duplicatas
-            if i != n // i:
-                soma += n // i
-    
+    if cache_somas is not None:
+        cache_somas.guardar(n, soma)
     return soma
 
-def eh_numero_perfeito(n: int) -> bool:
-    return n > 0 and calcular_soma_divisores(n) == n
+# Engines disponíveis para o cálculo das somas de divisores:
+# - 'divisao': divisão por tentativa, número a número (O(N·√N))
+# - 'crivo': crivo linear sobre o intervalo inteiro (O(N))
+# - 'numpy': tabela int64 contígua preenchida com somas vetorizadas (requer numpy)
+ENGINES = ('divisao', 'crivo', 'numpy')
+ENGINE_PADRAO = 'crivo'
+# Tamanho dos blocos usados nas comparações vetorizadas da engine 'numpy'
+BLOCO_NUMPY = 1 << 20
+# Primos usados no filtro rápido de parceiros fora do chunk (modo processos)
+LIMITE_PRIMOS_FILTRO = 200
+# Acima deste valor, calcular_soma_divisores troca a divisão por tentativa até √n
+# pela fatoração (Miller–Rabin e rho de Pollard–Brent, ver fatoracao.py)
+LIMITE_DIVISAO_TENTATIVA = 1 << 20
+# Filtro mais barato para as ligações pendentes do AnalisadorIncremental, que são
+# muitas; a fatoração confirma as poucas que passam
+LIMITE_PRIMOS_FILTRO_PENDENTES = 13
+# Arquivo padrão do armazenamento persistente de somas de divisores, e o
+# armazenamento ativo no processo (None = desativado, ver ativar_armazenamento)
+ARQUIVO_ARMAZENAMENTO_PADRAO = "somas_divisores.bin"
+armazenamento = None
+# Cache das somas de divisores compartilhado pelas chamadas de
+# calcular_soma_divisores e calcular_somas_lote no processo. Desligado por
+# padrão, para que os tempos medidos sejam sempre de cálculo (ver configurar_cache_somas)
+cache_somas = None
+# Na classificação em lote, os números até este limite usam uma tabela do crivo
+# (de 1 até o maior deles) quando são densos o bastante: ao menos um número
+# distinto a cada FATOR_DENSIDADE_LOTE posições da tabela
+LIMITE_TABELA_LOTE = 1 << 22
+FATOR_DENSIDADE_LOTE = 16
 
-def encontrar_numeros_perfeitos(limite: int) -> List[int]:
-    perfeitos = []
+# Cache dos expoentes de Mersenne (p com 2^p - 1 primo) já encontrados pelo teste
+# de Lucas–Lehmer, em ordem, e do maior expoente já testado
+expoentes_mersenne = []
+maior_expoente_testado = 1
+
+# Executores disponíveis para os chunks:
+# - 'threads': threading.Thread (sob o GIL do CPython, sem ganho em CPU)
+# - 'processos': ProcessPoolExecutor, um processo por núcleo
+# - 'memoria_compartilhada': processos que preenchem e consultam uma única
+#   tabela de somas em multiprocessing.shared_memory
+# - 'auto': threads em interpretador free-threaded (GIL desligado), processos caso contrário
+EXECUTORES = ('threads', 'processos', 'memoria_compartilhada', 'auto')
+EXECUTOR_PADRAO = 'threads'
+# Threads usadas pelo executor 'threads' quando num_threads não é informado
+# (o padrão original); 'auto' e os executores de processos usam um por núcleo.
+NUM_THREADS_PADRAO = 4
+# Quantidade média de chunks por worker quando o grão não é informado
+CHUNKS_POR_WORKER_PADRAO = 16
+
+def validar_engine(engine: str):
+    if engine not in ENGINES:
+        raise ValueError(f"Engine desconhecida: {engine!r} (opções: {', '.join(ENGINES)})")
+    if engine == 'numpy' and np is None:
+        raise ImportError("A engine 'numpy' requer o pacote numpy instalado")
+
+# Crivo linear (menor fator primo): somas[n] = sigma(n) - n para 0..limite.
+# sigma é multiplicativa, então sigma(p^k * m) = sigma(p^k) * sigma(m) com p
+# o menor fator primo de n; cada composto é marcado uma única vez. O(N).
+def calcular_somas_divisores_crivo(limite: int) -> List[int]:
+    if limite < 1:
+        return [0] * max(limite + 1, 0)
     
-    # Método otimizado usando primos de Mersenne para números pares
-    def eh_primo(n):
-        if n < 2:
-            return False
-        if n == 2:
-            return True
-        if n % 2 == 0:
-            return False
-        for i in range(3, int(math.sqrt(n)) + 1, 2):
-            if n % i == 0:
-                return False
-        return True
+    sigma = [0] * (limite + 1)
+    sigma[1] = 1
+    # Potência do menor primo que divide n (p^k) e a soma 1 + p + ... + p^k
+    potencia = [0] * (limite + 1)
+    soma_potencia = [0] * (limite + 1)
+    primos = []
     
-    # Verifica números perfeitos usando fórmula de Euclides
-    p = 2
-    while True:
-        mersenne = (2 ** p) - 1
-        if eh_primo(mersenne):
-            perfeito = (2 ** (p - 1)) * mersenne
-            if perfeito > limite:
+    for i in range(2, limite + 1):
+        if sigma[i] == 0:
+            # Ainda não marcado: i é primo
+            primos.append(i)
+            sigma[i] = i + 1
+            potencia[i] = i
+            soma_potencia[i] = i + 1
+        
+        sigma_i = sigma[i]
+        for p in primos:
+            ip = i * p
+            if ip > limite:
                 break
-            perfeitos.append(perfeito)
+            if i % p == 0:
+                # p já divide i: aumenta a potência do menor fator primo
+                potencia[ip] = potencia[i] * p
+                soma_potencia[ip] = soma_potencia[i] + potencia[ip]
+                sigma[ip] = sigma_i // soma_potencia[i] * soma_potencia[ip]
+                break
+            # p é um novo menor fator primo, coprimo com i
+            potencia[ip] = p
+            soma_potencia[ip] = p + 1
+            sigma[ip] = sigma_i * (p + 1)
+    
+    for n in range(1, limite + 1):
+        sigma[n] -= n
+    
+    return sigma
+
+# Tabela de somas como array NumPy int64 contíguo (8 bytes por número). Para
+# cada d até √limite, os múltiplos m = d*k com k >= d recebem o par de
+# divisores (d, k) em uma soma vetorizada sobre somas[d*d::d]; o divisor 1 é
+# somado de uma vez e o par (1, m) é omitido, resultando em sigma(n) - n.
+def calcular_somas_divisores_numpy(limite: int):
+    somas = np.zeros(max(limite + 1, 0), dtype=np.int64)
+    if limite < 2:
+        return somas
+    
+    somas[2:] = 1
+    for d in range(2, math.isqrt(limite) + 1):
+        # Divisor d em todos os múltiplos a partir de d²
+        somas[d * d::d] += d
+        # Divisor complementar k = m / d, para k > d
+        somas[d * (d + 1)::d] += np.arange(d + 1, limite // d + 1, dtype=np.int64)
+    
+    return somas
+
+# Com o armazenamento persistente ativo, a tabela é uma visão sem cópia do
+# arquivo mapeado e só o que falta além dele é calculado.
+def calcular_tabela_somas(limite: int, engine: str = ENGINE_PADRAO):
+    if armazenamento is not None:
+        return armazenamento.tabela(limite, como_numpy=engine == 'numpy')
+    if engine == 'numpy':
+        return calcular_somas_divisores_numpy(limite)
+    return calcular_somas_divisores_crivo(limite)
+
+# Ativa o armazenamento persistente de somas de divisores no arquivo indicado:
+# calcular_soma_divisores passa a consultá-lo e as tabelas crescem nele.
+def ativar_armazenamento(caminho: str = ARQUIVO_ARMAZENAMENTO_PADRAO) -> ArmazenamentoSomas:
+    global armazenamento
+    armazenamento = ArmazenamentoSomas(caminho, calcular_somas_divisores_segmento)
+    return armazenamento
+
+def desativar_armazenamento():
+    global armazenamento
+    armazenamento = None
+
+# Ativa (ou recria) o cache de calcular_soma_divisores e calcular_somas_lote
+# com os limites de memória dados (com os dois em 0, o cache fica desativado).
+# As threads do processo compartilham o mesmo cache; cada processo do pool tem o seu.
+def configurar_cache_somas(limite_denso: int = LIMITE_DENSO_PADRAO,
+                           capacidade_lru: int = CAPACIDADE_LRU_PADRAO) -> Optional[CacheSomas]:
+    global cache_somas
+    cache_somas = CacheSomas(limite_denso, capacidade_lru) if limite_denso or capacidade_lru else None
+    return cache_somas
+
+def estatisticas_cache_somas() -> Dict:
+    if cache_somas is None:
+        return {}
+    return cache_somas.estatisticas()
+
+def encontrar_numeros_perfeitos_tabela(somas: List[int], inicio: int = 1) -> List[int]:
+    # Tabelas NumPy são comparadas de forma vetorizada (s[n] == n)
+    if np is not None and isinstance(somas, np.ndarray):
+        perfeitos = []
+        for base in range(max(inicio, 1), len(somas), BLOCO_NUMPY):
+            bloco = somas[base:base + BLOCO_NUMPY]
+            numeros = np.arange(base, base + len(bloco), dtype=np.int64)
+            perfeitos.extend(numeros[bloco == numeros].tolist())
+        return perfeitos
+    return [n for n in range(max(inicio, 1), len(somas)) if somas[n] == n]
+
+def encontrar_pares_amigaveis_tabela(somas: List[int]) -> List[Tuple[int, int]]:
+    # Cada par é encontrado uma única vez, a partir do seu menor elemento
+    limite = len(somas) - 1
+    if np is not None and isinstance(somas, np.ndarray):
+        return encontrar_pares_amigaveis_tabela_numpy(somas)
+    
+    pares_amigaveis = []
+    
+    for n in range(1, limite + 1):
+        soma_n = somas[n]
+        if n < soma_n <= limite and somas[soma_n] == n:
+            pares_amigaveis.append((n, soma_n))
+    
+    return pares_amigaveis
+
+def encontrar_pares_amigaveis_tabela_numpy(somas) -> List[Tuple[int, int]]:
+    limite = len(somas) - 1
+    pares_amigaveis = []
+    
+    # Processa em blocos para limitar os arrays temporários
+    for base in range(0, limite + 1, BLOCO_NUMPY):
+        bloco = somas[base:base + BLOCO_NUMPY]
+        numeros = np.arange(base, base + len(bloco), dtype=np.int64)
+        candidatos = numeros[(bloco > numeros) & (bloco <= limite)]
         
-        p += 1
-        # Limite prático para evitar overflow
-        if p > 50:
+        parceiros = somas[candidatos]
+        confirmados = somas[parceiros] == candidatos
+        pares_amigaveis.extend(zip(candidatos[confirmados].tolist(), parceiros[confirmados].tolist()))
+    
+    return pares_amigaveis
+
+# Gera todos os primos até o limite pelo crivo de Eratóstenes.
+def gerar_primos(limite: int) -> List[int]:
+    if limite < 2:
+        return []
+    
+    crivo = bytearray([1]) * (limite + 1)
+    crivo[0] = crivo[1] = 0
+    for i in range(2, math.isqrt(limite) + 1):
+        if crivo[i]:
+            crivo[i * i::i] = bytes(len(range(i * i, limite + 1, i)))
+    
+    return [i for i in range(limite + 1) if crivo[i]]
+
+# Calcula as somas de divisores próprios apenas da janela [inicio, fim]
+# (crivo segmentado), sem passar pelos números de 1 a inicio - 1.
+#
+# Para cada primo p <= √fim, os múltiplos de p na janela têm a potência de p
+# removida e sigma multiplicada por 1 + p + ... + p^k. O que sobra após
+# todos os primos é 1 ou um único primo maior que √fim.
+#
+# Retorna uma lista onde somas[i] = sigma(inicio + i) - (inicio + i).
+# Requer inicio >= 1; `primos` deve cobrir todos os primos até √fim.
+def calcular_somas_divisores_segmento(inicio: int, fim: int, primos: List[int] = None) -> List[int]:
+    if inicio < 1:
+        raise ValueError("O crivo segmentado requer inicio >= 1")
+    if fim < inicio:
+        return []
+    if primos is None:
+        primos = gerar_primos(math.isqrt(fim))
+    
+    tamanho = fim - inicio + 1
+    restante = list(range(inicio, fim + 1))
+    sigma = [1] * tamanho
+    
+    for p in primos:
+        if p * p > fim:
             break
+        # Primeiro índice da janela divisível por p
+        for i in range((-inicio) % p, tamanho, p):
+            r = restante[i] // p
+            potencia = p
+            soma_potencia = 1 + p
+            while r % p == 0:
+                r //= p
+                potencia *= p
+                soma_potencia += potencia
+            restante[i] = r
+            sigma[i] *= soma_potencia
+    
+    somas = sigma
+    for i in range(tamanho):
+        r = restante[i]
+        if r > 1:
+            # Fator primo restante maior que √fim
+            somas[i] *= r + 1
+        somas[i] -= inicio + i
+    
+    return somas
+
+# Calcula a soma dos divisores próprios de n fatorando-o pela lista de primos,
+# que deve cobrir todos os primos até √n.
+def calcular_soma_divisores_primos(n: int, primos: List[int]) -> int:
+    if n <= 1:
+        return 0
+    
+    r = n
+    sigma = 1
+    for p in primos:
+        if p * p > r:
+            break
+        if r % p == 0:
+            r //= p
+            potencia = p
+            soma_potencia = 1 + p
+            while r % p == 0:
+                r //= p
+                potencia *= p
+                soma_potencia += potencia
+            sigma *= soma_potencia
+    if r > 1:
+        sigma *= r + 1
+    
+    return sigma - n
+
+# Filtro barato para descartar candidatos a par (a, b = s(a)) sem fatorar b
+# por completo. Precisa valer sigma(b) = a + b.
+#
+# Removendo de b os primos até P = primos_filtro[-1], sobra b = f * r, com r
+# sem fatores <= P. Como sigma(b) = sigma(f) * sigma(r) e cada fator primo de
+# r contribui com menos de (P + 1) / P para sigma(r) / r, o quociente
+# (a + b) / sigma(f) precisa ser inteiro e estar em (r, r * ((P + 1) / P)^k],
+# com k o número máximo de fatores primos de r.
+def pode_ser_par_amigavel(a: int, b: int, primos_filtro: List[int]) -> bool:
+    r = b
+    sigma_f = 1
+    for p in primos_filtro:
+        if r % p == 0:
+            r //= p
+            potencia = p
+            soma_potencia = 1 + p
+            while r % p == 0:
+                r //= p
+                potencia *= p
+                soma_potencia += potencia
+            sigma_f *= soma_potencia
+    
+    alvo = a + b
+    if r == 1:
+        return sigma_f == alvo
+    if alvo % sigma_f:
+        return False
+    
+    quociente = alvo // sigma_f
+    if quociente <= r:
+        return False
+    
+    maior_primo = primos_filtro[-1]
+    k = int(math.log(r) / math.log(maior_primo + 1)) + 1
+    return quociente <= r * ((maior_primo + 1) / maior_primo) ** k
+
+def eh_numero_perfeito(n: int) -> bool:
+    return n > 0 and calcular_soma_divisores(n) == n
+
+# Teste de Lucas–Lehmer: para p primo, 2^p - 1 é primo se e só se s(p-2) = 0
+# (mod 2^p - 1), com s(0) = 4 e s(k+1) = s(k)² - 2. A redução módulo 2^p - 1
+# usa máscara e deslocamento, pois 2^p = 1 (mod 2^p - 1).
+def teste_lucas_lehmer(p: int) -> bool:
+    if p == 2:
+        return True
+    mersenne = (1 << p) - 1
+    s = 4
+    for _ in range(p - 2):
+        s = s * s - 2
+        s = (s & mersenne) + (s >> p)
+        if s >= mersenne:
+            s -= mersenne
+    return s == 0
+
+# Expoentes de Mersenne p <= limite_expoente. Ficam em cache no módulo: só os
+# expoentes ainda não testados passam pelo teste, e apenas os primos (se p é
+# composto, 2^p - 1 também é).
+def calcular_expoentes_mersenne(limite_expoente: int) -> List[int]:
+    global maior_expoente_testado
+    for p in range(maior_expoente_testado + 1, limite_expoente + 1):
+        if eh_primo(p) and teste_lucas_lehmer(p):
+            expoentes_mersenne.append(p)
+        maior_expoente_testado = p
+    return [p for p in expoentes_mersenne if p <= limite_expoente]
+
+# Com engine='divisao', usa a fórmula de Euclides com os expoentes de Mersenne
+# que cabem no limite (ver calcular_expoentes_mersenne). Não há busca de ímpares:
+# nenhum perfeito ímpar é conhecido, e está provado que não existe nenhum abaixo de 10^1500.
+def encontrar_numeros_perfeitos(limite: int, engine: str = ENGINE_PADRAO) -> List[int]:
+    validar_engine(engine)
+    if engine != 'divisao':
+        return encontrar_numeros_perfeitos_tabela(calcular_tabela_somas(limite, engine))
     
-    # Verifica números ímpares perfeitos por força bruta (muito raros)
-    # Nota: Não se conhece nenhum número perfeito ímpar
-    for n in range(1, min(limite + 1, 10000), 2):  # Limite menor para ímpares
-        if eh_numero_perfeito(n):
-            perfeitos.append(n)
+    # 2^(p-1) * (2^p - 1) tem 2p - 1 bits, então só expoentes até este cabem no limite
+    limite_expoente = (max(limite, 0).bit_length() + 1) // 2
+    perfeitos = []
+    for p in calcular_expoentes_mersenne(limite_expoente):
+        perfeito = (1 << (p - 1)) * ((1 << p) - 1)
+        if perfeito <= limite:
+            perfeitos.append(perfeito)
     
-    return sorted(perfeitos)
+    return perfeitos
 
 def sao_numeros_amigaveis(a: int, b: int) -> bool:
     return (a != b and 
             calcular_soma_divisores(a) == b and 
             calcular_soma_divisores(b) == a)
 
-def encontrar_pares_amigaveis(limite: int) -> List[Tuple[int, int]]:
-    pares_amigaveis = []
+def encontrar_pares_amigaveis(limite: int, engine: str = ENGINE_PADRAO) -> List[Tuple[int, int]]:
+    validar_engine(engine)
+    if engine != 'divisao':
+        return encontrar_pares_amigaveis_tabela(calcular_tabela_somas(limite, engine))
+    
+    pares_amigaveis = set()
     soma_divisores_cache = {}
     
     def obter_soma_divisores(n):
         if n not in soma_divisores_cache:
+            contar('cache_somas_faltas')
             soma_divisores_cache[n] = calcular_soma_divisores(n)
+        else:
+            contar('cache_somas_acertos')
         return soma_divisores_cache[n]
     
     verificados = set()
@@ -94,20 +450,53 @@ def encontrar_pares_amigaveis(limite: int) -> List[Tuple[int, int]]:
             if soma_soma_n == n:
                 # Encontrou par amigável
                 par = tuple(sorted([n, soma_n]))
-                if par not in pares_amigaveis:
-                    pares_amigaveis.append(par)
+                pares_amigaveis.add(par)
                 verificados.add(n)
                 verificados.add(soma_n)
     
     return sorted(pares_amigaveis)
 
 
-def processar_chunk_soma_divisores(chunk: List[int], resultado_queue: queue.Queue):
-    resultados_chunk = {}
-    for numero in chunk:
-        resultados_chunk[numero] = calcular_soma_divisores(numero)
+# Calcula s(n) uma única vez para cada número distinto de `numeros` e devolve
+# {n: s(n)} (acrescentado a `somas`, se informado). Números já presentes no
+# armazenamento persistente são lidos dele; números pequenos e densos saem de
+# uma única tabela do crivo; os demais são fatorados (tabela de primos pequenos
+# compartilhada e rho de Pollard).
+def calcular_somas_lote(numeros, somas: Optional[Dict[int, int]] = None) -> Dict[int, int]:
+    if somas is None:
+        somas = {}
+    faltantes = []
+    for n in set(numeros):
+        if n in somas:
+            continue
+        soma = armazenamento.obter(n) if armazenamento is not None else None
+        if soma is None and cache_somas is not None and n > 1:
+            soma = cache_somas.obter(n)
+        if n <= 1:
+            somas[n] = 0
+        elif soma is not None:
+            somas[n] = soma
+        else:
+            faltantes.append(n)
+    
+    calculados = faltantes
+    pequenos = [n for n in faltantes if n <= LIMITE_TABELA_LOTE]
+    if pequenos and len(pequenos) * FATOR_DENSIDADE_LOTE >= max(pequenos):
+        tabela = calcular_somas_divisores_crivo(max(pequenos))
+        for n in pequenos:
+            somas[n] = tabela[n]
+        faltantes = [n for n in faltantes if n > LIMITE_TABELA_LOTE]
     
-    resultado_queue.put(resultados_chunk)
+    for n in faltantes:
+        somas[n] = soma_divisores_fatoracao(n)
+    
+    if cache_somas is not None:
+        for n in calculados:
+            cache_somas.guardar(n, somas[n])
+    return somas
+
+def processar_chunk_soma_divisores(chunk: List[int], resultado_queue: queue.Queue):
+    resultado_queue.put(calcular_somas_lote(chunk))
 
 def calcular_soma_divisores_paralelo(numeros: List[int], num_threads: int = 4) -> Dict[int, int]:
     if not numeros:
@@ -140,15 +529,43 @@ def calcular_soma_divisores_paralelo(numeros: List[int], num_threads: int = 4) -
     
     return resultados_finais
 
-def processar_chunk_amigaveis(inicio: int, fim: int, limite_global: int, resultado_queue: queue.Queue):
+def gil_desativado() -> bool:
+    # Interpretador free-threaded (PEP 703) rodando com o GIL desligado
+    return hasattr(sys, '_is_gil_enabled') and not sys._is_gil_enabled()
+
+def resolver_executor(executor: str) -> str:
+    if executor not in EXECUTORES:
+        raise ValueError(f"Executor desconhecido: {executor!r} (opções: {', '.join(EXECUTORES)})")
+    if executor == 'auto':
+        return 'threads' if gil_desativado() else 'processos'
+    return executor
+
+# Recebe o executor pedido (antes de resolver 'auto').
+def resolver_num_workers(num_threads: Optional[int], executor: str = EXECUTOR_PADRAO) -> int:
+    if num_threads:
+        return num_threads
+    if executor == 'threads':
+        return NUM_THREADS_PADRAO
+    # Sem valor explícito, usa um worker por núcleo disponível
+    return os.cpu_count() or 1
+
+def calcular_chunk_amigaveis(inicio: int, fim: int, limite_global: int,
+                             somas: Optional[List[int]] = None) -> Tuple[List[int], List[Tuple[int, int]]]:
+    perfeitos_chunk = []
     pares_chunk = []
     soma_divisores_cache = {}
     
-    def obter_soma_divisores(n):
+    def consultar_cache(n):
         if n not in soma_divisores_cache:
+            contar('cache_somas_faltas')
             soma_divisores_cache[n] = calcular_soma_divisores(n)
+        else:
+            contar('cache_somas_acertos')
         return soma_divisores_cache[n]
     
+    # Com a tabela do crivo já calculada, as threads apenas a consultam
+    obter_soma_divisores = somas.__getitem__ if somas is not None else consultar_cache
+    
     verificados_locais = set()
     
     for n in range(inicio, fim + 1):
@@ -157,7 +574,9 @@ def processar_chunk_amigaveis(inicio: int, fim: int, limite_global: int, resulta
             
         soma_n = obter_soma_divisores(n)
         
-        if soma_n != n and soma_n <= limite_global:
+        if soma_n == n:
+            perfeitos_chunk.append(n)
+        elif soma_n <= limite_global:
             soma_soma_n = obter_soma_divisores(soma_n)
             
             if soma_soma_n == n:
@@ -166,35 +585,264 @@ def processar_chunk_amigaveis(inicio: int, fim: int, limite_global: int, resulta
                 verificados_locais.add(n)
                 verificados_locais.add(soma_n)
     
+    return perfeitos_chunk, pares_chunk
+
+def processar_chunk_amigaveis(inicio: int, fim: int, limite_global: int, resultado_queue: queue.Queue,
+                              somas: Optional[List[int]] = None):
+    with medir('chunk.pares'):
+        _, pares_chunk = calcular_chunk_amigaveis(inicio, fim, limite_global, somas)
+    contar('chunks_processados')
     resultado_queue.put(pares_chunk)
 
-def encontrar_pares_amigaveis_paralelo(limite: int, num_threads: int = 4) -> List[Tuple[int, int]]:
-    if limite <= 0:
+# Tarefa executada em um processo do pool. Recebe apenas o descritor do chunk
+# (inicio, fim, limite, engine) e devolve só os perfeitos e pares encontrados.
+# Com engines de tabela, o chunk é processado pelo crivo segmentado: cada par
+# é atribuído ao chunk do seu menor elemento, com o parceiro até limite_global
+# (e, com pares_abaixo_de, também os pares que cruzam esse valor; ver
+# analisar_chunk_segmentado).
+def processar_chunk_processo(inicio: int, fim: int, limite_global: int, engine: str,
+                             pares_abaixo_de: Optional[int] = None) -> Tuple[List[int], List[Tuple[int, int]]]:
+    if engine == 'divisao':
+        return calcular_chunk_amigaveis(inicio, fim, limite_global)
+    return analisar_chunk_segmentado(inicio, fim, limite_global, pares_abaixo_de=pares_abaixo_de)
+
+# Chunk pelo crivo segmentado. Se a lista `pendentes` for informada, recebe as
+# ligações (n, s(n)) com s(n) além de limite_global que passam pelo filtro,
+# candidatas a par quando o intervalo for estendido (ver AnalisadorIncremental).
+# Com pares_abaixo_de, os pares (s(n), n) com s(n) < pares_abaixo_de também
+# saem no chunk do maior elemento: são os que cruzam o início do intervalo.
+def analisar_chunk_segmentado(inicio: int, fim: int, limite_global: int,
+                              pendentes: Optional[List[Tuple[int, int]]] = None,
+                              pares_abaixo_de: Optional[int] = None) -> Tuple[List[int], List[Tuple[int, int]]]:
+    primos = gerar_primos(math.isqrt(limite_global))
+    primos_filtro = [p for p in primos if p <= LIMITE_PRIMOS_FILTRO] or [2]
+    primos_pendentes = [p for p in primos if p <= LIMITE_PRIMOS_FILTRO_PENDENTES] or [2]
+    somas = calcular_somas_divisores_segmento(inicio, fim, primos)
+    
+    perfeitos_chunk = []
+    pares_chunk = []
+    for i, soma_n in enumerate(somas):
+        n = inicio + i
+        if soma_n == n:
+            perfeitos_chunk.append(n)
+        elif n < soma_n <= limite_global:
+            if soma_n <= fim:
+                eh_par = somas[soma_n - inicio] == n
+            else:
+                eh_par = (pode_ser_par_amigavel(n, soma_n, primos_filtro) and
+                          calcular_soma_divisores_primos(soma_n, primos) == n)
+            if eh_par:
+                pares_chunk.append((n, soma_n))
+        elif pendentes is not None and n < soma_n and pode_ser_par_amigavel(n, soma_n, primos_pendentes):
+            pendentes.append((n, soma_n))
+        elif (pares_abaixo_de is not None and 1 < soma_n < pares_abaixo_de and
+              pode_ser_par_amigavel(soma_n, n, primos_filtro) and
+              calcular_soma_divisores_primos(soma_n, primos) == n):
+            pares_chunk.append((soma_n, n))
+    
+    return perfeitos_chunk, pares_chunk
+
+# Tarefa de um chunk da parte nova do AnalisadorIncremental.
+def processar_chunk_incremental(inicio: int, fim: int, limite_global: int,
+                                pares_abaixo_de: Optional[int] = None
+                                ) -> Tuple[List[int], List[Tuple[int, int]], List[Tuple[int, int]]]:
+    pendentes = []
+    perfeitos_chunk, pares_chunk = analisar_chunk_segmentado(inicio, fim, limite_global, pendentes,
+                                                             pares_abaixo_de)
+    return perfeitos_chunk, pares_chunk, pendentes
+
+def executar_chunks_processos(chunks: List[Tuple[int, int]], limite_global: int, engine: str,
+                              num_processos: int) -> Tuple[List[int], List[Tuple[int, int]]]:
+    perfeitos = []
+    pares = []
+    
+    with ProcessPoolExecutor(max_workers=num_processos) as pool:
+        futuros = [pool.submit(processar_chunk_processo, inicio, fim, limite_global, engine)
+                   for inicio, fim in chunks]
+        for futuro in futuros:
+            # Tempo em que o processo principal fica parado à espera dos workers
+            with medir('processos.espera_resultado'):
+                perfeitos_chunk, pares_chunk = futuro.result()
+            contar('chunks_processados')
+            perfeitos.extend(perfeitos_chunk)
+            pares.extend(pares_chunk)
+    
+    return sorted(set(perfeitos)), sorted(set(pares))
+
+# Executa os chunks gravando cada um no checkpoint assim que termina, em
+# qualquer ordem. Os chunks usam o crivo segmentado (pares atribuídos ao chunk
+# do menor elemento), o que torna o resultado de cada chunk independente dos demais.
+# Os pares que cruzam inicio_intervalo são registrados no chunk do maior elemento.
+def executar_chunks_checkpoint(chunks: List[Tuple[int, int]], limite_global: int, executor: str,
+                               num_workers: int, registro: Checkpoint, inicio_intervalo: int = 1):
+    classe_pool = ThreadPoolExecutor if executor == 'threads' else ProcessPoolExecutor
+    with classe_pool(max_workers=num_workers) as pool:
+        futuros = {pool.submit(processar_chunk_processo, inicio, fim, limite_global, 'crivo',
+                               inicio_intervalo): (inicio, fim)
+                   for inicio, fim in chunks}
+        for futuro in as_completed(futuros):
+            inicio, fim = futuros[futuro]
+            perfeitos_chunk, pares_chunk = futuro.result()
+            registro.registrar(inicio, fim, perfeitos_chunk, pares_chunk)
+
+def preencher_faixa_compartilhada(nome_memoria: str, inicio: int, fim: int, limite_global: int, engine: str):
+    memoria = shared_memory.SharedMemory(name=nome_memoria)
+    somas = memoria.buf.cast('q')
+    try:
+        if engine == 'divisao':
+            for n in range(inicio, fim + 1):
+                somas[n] = calcular_soma_divisores(n)
+        else:
+            primos = gerar_primos(math.isqrt(limite_global))
+            somas[inicio:fim + 1] = array('q', calcular_somas_divisores_segmento(inicio, fim, primos))
+    finally:
+        somas.release()
+        memoria.close()
+
+def verificar_faixa_compartilhada(nome_memoria: str, inicio: int, fim: int,
+                                  limite_global: int) -> Tuple[List[int], List[Tuple[int, int]]]:
+    memoria = shared_memory.SharedMemory(name=nome_memoria)
+    somas = memoria.buf.cast('q')
+    perfeitos_faixa = []
+    pares_faixa = []
+    try:
+        for n in range(inicio, fim + 1):
+            soma_n = somas[n]
+            if soma_n == n:
+                perfeitos_faixa.append(n)
+            elif n < soma_n <= limite_global and somas[soma_n] == n:
+                pares_faixa.append((n, soma_n))
+    finally:
+        somas.release()
+        memoria.close()
+    
+    return perfeitos_faixa, pares_faixa
+
+# Tabela de somas única em memória compartilhada (int64 indexado por n).
+# Fase 1: cada processo preenche a sua faixa da tabela. Fase 2: depois que
+# todas as faixas estão prontas, cada processo verifica s(s(n)) == n na sua
+# faixa lendo a tabela global, sem recalcular somas de outras faixas.
+def executar_chunks_memoria_compartilhada(chunks: List[Tuple[int, int]], limite_global: int, engine: str,
+                                          num_processos: int) -> Tuple[List[int], List[Tuple[int, int]]]:
+    memoria = shared_memory.SharedMemory(create=True, size=8 * (limite_global + 1))
+    perfeitos = []
+    pares = []
+    
+    try:
+        memoria.buf[:8] = bytes(8)  # s(0) = 0
+        with ProcessPoolExecutor(max_workers=num_processos) as pool:
+            preenchimentos = [pool.submit(preencher_faixa_compartilhada, memoria.name, inicio, fim,
+                                          limite_global, engine)
+                              for inicio, fim in chunks]
+            for futuro in preenchimentos:
+                futuro.result()
+            
+            verificacoes = [pool.submit(verificar_faixa_compartilhada, memoria.name, inicio, fim, limite_global)
+                            for inicio, fim in chunks]
+            for futuro in verificacoes:
+                perfeitos_faixa, pares_faixa = futuro.result()
+                perfeitos.extend(perfeitos_faixa)
+                pares.extend(pares_faixa)
+    finally:
+        memoria.close()
+        memoria.unlink()
+    
+    return perfeitos, pares
+
+# Divide [inicio, limite] em vários chunks pequenos de custo aproximadamente
+# igual, para serem distribuídos dinamicamente entre os workers. Na divisão por
+# tentativa o custo de n cresce com √n (custo acumulado ~ x^1.5), então os chunks
+# encolhem no fim do intervalo; nas engines de tabela o custo é uniforme.
+# tamanho_grao é a largura do último chunk (o mais caro); sem ele, são gerados
+# cerca de CHUNKS_POR_WORKER_PADRAO chunks por worker. Todo o intervalo é coberto.
+def dividir_em_chunks(limite: int, num_threads: int, engine: str = ENGINE_PADRAO,
+                      tamanho_grao: Optional[int] = None, inicio: int = 1) -> List[Tuple[int, int]]:
+    if limite < inicio:
         return []
     
-    chunk_size = max(1, limite // num_threads)
+    expoente = 1.5 if engine == 'divisao' else 1.0
+    base = inicio - 1
+    custo_base = base ** expoente
+    custo_total = limite ** expoente - custo_base
+    
+    if tamanho_grao:
+        custo_chunk = limite ** expoente - max(limite - tamanho_grao, base) ** expoente
+    else:
+        custo_chunk = custo_total / (num_threads * CHUNKS_POR_WORKER_PADRAO)
+    num_chunks = max(1, min(limite - base, math.ceil(custo_total / custo_chunk)))
+    
     chunks = []
+    inicio_chunk = inicio
+    for k in range(1, num_chunks + 1):
+        if k == num_chunks:
+            fim_chunk = limite
+        else:
+            fronteira = (custo_base + custo_total * k / num_chunks) ** (1 / expoente)
+            fim_chunk = min(max(int(fronteira), inicio_chunk), limite)
+        if fim_chunk >= inicio_chunk:
+            chunks.append((inicio_chunk, fim_chunk))
+            inicio_chunk = fim_chunk + 1
+        if inicio_chunk > limite:
+            break
     
-    for i in range(num_threads):
-        inicio = i * chunk_size + 1
-        fim = min((i + 1) * chunk_size, limite)
-        
-        if inicio <= limite:
-            chunks.append((inicio, fim))
+    return chunks
+
+# Worker das threads: retira chunks da fila compartilhada até ela esvaziar,
+# de modo que nenhuma thread fica ociosa enquanto houver trabalho.
+def trabalhador_chunks_amigaveis(fila_chunks: queue.Queue, limite_global: int, resultado_queue: queue.Queue,
+                                 somas: Optional[List[int]] = None):
+    while True:
+        try:
+            inicio, fim = fila_chunks.get_nowait()
+        except queue.Empty:
+            return
+        processar_chunk_amigaveis(inicio, fim, limite_global, resultado_queue, somas)
+
+def encontrar_pares_amigaveis_paralelo(limite: int, num_threads: Optional[int] = None, engine: str = ENGINE_PADRAO,
+                                       somas: Optional[List[int]] = None,
+                                       executor: str = EXECUTOR_PADRAO,
+                                       tamanho_grao: Optional[int] = None) -> List[Tuple[int, int]]:
+    validar_engine(engine)
+    num_threads = resolver_num_workers(num_threads, executor)
+    executor = resolver_executor(executor)
+    if limite <= 0:
+        return []
+    
+    # Com a tabela pronta, consultar cada número custa o mesmo
+    chunks = dividir_em_chunks(limite, num_threads, engine if somas is None else 'crivo', tamanho_grao)
+    
+    # Processos recebem só descritores dos chunks, nunca a tabela inteira
+    if executor == 'processos' and somas is None:
+        return executar_chunks_processos(chunks, limite, engine, num_threads)[1]
+    if executor == 'memoria_compartilhada' and somas is None:
+        return executar_chunks_memoria_compartilhada(chunks, limite, engine, num_threads)[1]
+    
+    if engine != 'divisao' and somas is None:
+        with medir('pares.somas_divisores'):
+            somas = calcular_tabela_somas(limite, engine)
+    
+    # A busca vetorizada sobre o array já percorre a tabela inteira de uma vez
+    if engine == 'numpy':
+        return encontrar_pares_amigaveis_tabela(somas)
     
     num_threads_efetivas = min(num_threads, len(chunks))
     
+    fila_chunks = queue.Queue()
+    for chunk in chunks:
+        fila_chunks.put(chunk)
+    
     resultado_queue = queue.Queue()
     threads = []
     
-    for inicio, fim in chunks:
-        t = Thread(target=processar_chunk_amigaveis, 
-                  args=(inicio, fim, limite, resultado_queue))
+    for _ in range(num_threads_efetivas):
+        t = Thread(target=trabalhador_chunks_amigaveis, 
+                  args=(fila_chunks, limite, resultado_queue, somas))
         t.start()
         threads.append(t)
     
-    for t in threads:
-        t.join()
+    with medir('threads.espera'):
+        for t in threads:
+            t.join()
     
     todos_pares = []
     while not resultado_queue.empty():
@@ -204,67 +852,135 @@ def encontrar_pares_amigaveis_paralelo(limite: int, num_threads: int = 4) -> Lis
     pares_unicos = list(set(todos_pares))
     return sorted(pares_unicos)
 
-def processar_chunk_verificacao(numeros_chunk: List[int], resultado_queue: queue.Queue):
-    resultados_chunk = []
+# Classifica um chunk de números em tuplas compactas
+# (numero, soma_divisores_proprios, eh_perfeito, par_amigavel), calculando cada
+# soma de divisores uma única vez: primeiro s(n) de todos, depois s(s(n)) dos
+# candidatos a par amigável.
+def classificar_chunk_verificacao(numeros_chunk: List[int]) -> List[Tuple[int, int, bool, Optional[int]]]:
+    somas = calcular_somas_lote(numeros_chunk)
+    calcular_somas_lote([somas[n] for n in numeros_chunk if somas[n] != n], somas)
     
+    resultados_chunk = []
     for n in numeros_chunk:
-        soma_divisores = calcular_soma_divisores(n)
-        eh_perfeito = eh_numero_perfeito(n)
-        
-        # Verifica se tem par amigável
+        soma_divisores = somas[n]
         par_amigavel = None
-        if soma_divisores != n and calcular_soma_divisores(soma_divisores) == n:
+        if soma_divisores != n and somas[soma_divisores] == n:
             par_amigavel = soma_divisores
-        
-        resultado = {
-            'numero': n,
-            'soma_divisores_proprios': soma_divisores,
-            'eh_perfeito': eh_perfeito,
-            'par_amigavel': par_amigavel,
-            'eh_amigavel': par_amigavel is not None
-        }
-        
-        resultados_chunk.append(resultado)
+        resultados_chunk.append((n, soma_divisores, n > 0 and soma_divisores == n, par_amigavel))
     
-    resultado_queue.put(resultados_chunk)
+    return resultados_chunk
 
-def verificar_numeros_paralelo(numeros: List[int], num_threads: int = 4) -> List[Dict]:
-    if not numeros:
-        return []
-    
-    chunk_size = max(1, len(numeros) // num_threads)
-    chunks = []
-    
-    for i in range(0, len(numeros), chunk_size):
-        chunk = numeros[i:i + chunk_size]
-        chunks.append(chunk)
-    
-    resultado_queue = queue.Queue()
-    threads = []
-    
-    for chunk in chunks:
-        t = Thread(target=processar_chunk_verificacao, args=(chunk, resultado_queue))
-        t.start()
-        threads.append(t)
+def montar_resultado_verificacao(tupla: Tuple[int, int, bool, Optional[int]]) -> Dict:
+    n, soma_divisores, eh_perfeito, par_amigavel = tupla
+    return {
+        'numero': n,
+        'soma_divisores_proprios': soma_divisores,
+        'eh_perfeito': eh_perfeito,
+        'par_amigavel': par_amigavel,
+        'eh_amigavel': par_amigavel is not None
+    }
+
+def processar_chunk_verificacao(numeros_chunk: List[int], resultado_queue: queue.Queue):
+    resultado_queue.put(classificar_chunk_verificacao(numeros_chunk))
+
+# Classificação em lote de números quaisquer (fora de ordem, repetidos, de
+# qualquer tamanho): os números distintos são divididos entre os workers e o
+# resultado vem em colunas, uma linha por número distinto em ordem crescente.
+def classificar_numeros_paralelo(numeros, num_threads: Optional[int] = None,
+                                 executor: str = EXECUTOR_PADRAO) -> Dict[str, List]:
+    num_threads = resolver_num_workers(num_threads, executor)
+    executor = resolver_executor(executor)
+    distintos = sorted({int(n) for n in numeros})
+    colunas = {'numero': [], 'soma_divisores_proprios': [], 'eh_perfeito': [], 'par_amigavel': []}
     
-    for t in threads:
-        t.join()
+    # Chunks intercalados: números grandes (fatoração mais cara) ficam espalhados
+    chunks = [distintos[i::num_threads] for i in range(min(num_threads, len(distintos)))]
     
-    todos_resultados = []
-    while not resultado_queue.empty():
-        chunk_resultado = resultado_queue.get()
-        todos_resultados.extend(chunk_resultado)
+    # Não há tabela a compartilhar na verificação de números avulsos
+    if executor in ('processos', 'memoria_compartilhada'):
+        with ProcessPoolExecutor(max_workers=num_threads) as pool:
+            resultados_chunks = list(pool.map(classificar_chunk_verificacao, chunks))
+    else:
+        resultado_queue = queue.Queue()
+        threads = []
+        
+        for chunk in chunks:
+            t = Thread(target=processar_chunk_verificacao, args=(chunk, resultado_queue))
+            t.start()
+            threads.append(t)
+        
+        for t in threads:
+            t.join()
+        
+        resultados_chunks = [resultado_queue.get() for _ in chunks]
     
-    return todos_resultados
+    for tupla in sorted(tupla for resultado_chunk in resultados_chunks for tupla in resultado_chunk):
+        for coluna, valor in zip(colunas, tupla):
+            colunas[coluna].append(valor)
+    colunas['eh_amigavel'] = [par is not None for par in colunas['par_amigavel']]
+    return colunas
+
+# Um resultado por número de entrada, na mesma ordem; números repetidos são
+# classificados uma única vez.
+def verificar_numeros_paralelo(numeros: List[int], num_threads: Optional[int] = None,
+                               executor: str = EXECUTOR_PADRAO) -> List[Dict]:
+    colunas = classificar_numeros_paralelo(numeros, num_threads, executor)
+    linhas = {n: montar_resultado_verificacao((n, soma, eh_perfeito, par))
+              for n, soma, eh_perfeito, par in zip(colunas['numero'], colunas['soma_divisores_proprios'],
+                                                   colunas['eh_perfeito'], colunas['par_amigavel'])}
+    return [dict(linhas[int(n)]) for n in numeros]
 
-def analisar_intervalo_paralelo(inicio: int, fim: int, num_threads: int = 4) -> Dict:
+# Com checkpoint (caminho de arquivo), só os trechos ainda não concluídos são
+# divididos em chunks e cada chunk concluído é gravado no arquivo, com os pares
+# que cruzam inicio no chunk do maior elemento; o resultado é o mesmo da
+# varredura sem checkpoint. Rodar de novo com o mesmo arquivo retoma a
+# varredura de onde parou.
+def analisar_intervalo_paralelo(inicio: int, fim: int, num_threads: Optional[int] = None, engine: str = ENGINE_PADRAO,
+                                executor: str = EXECUTOR_PADRAO, tamanho_grao: Optional[int] = None,
+                                checkpoint: Optional[str] = None) -> Dict:
+    validar_engine(engine)
+    num_threads = resolver_num_workers(num_threads, executor)
+    executor = resolver_executor(executor)
     start_time = time.time()
-    perfeitos = [n for n in encontrar_numeros_perfeitos(fim) if n >= inicio]
-    todos_pares = encontrar_pares_amigaveis_paralelo(fim, num_threads)
-    pares_no_intervalo = [
-        par for par in todos_pares 
-        if par[0] >= inicio or par[1] >= inicio
-    ]
+    if checkpoint is not None:
+        inicio = max(inicio, 1)
+        with Checkpoint(checkpoint, fim) as registro:
+            chunks = []
+            for inicio_pendente, fim_pendente in registro.faixas_pendentes(inicio, fim):
+                chunks.extend(dividir_em_chunks(fim_pendente, num_threads, 'crivo', tamanho_grao, inicio_pendente))
+            executar_chunks_checkpoint(chunks, fim, executor, num_threads, registro, inicio)
+            perfeitos, todos_pares = registro.resultados(inicio, fim)
+            todos_pares = sorted(todos_pares + registro.pares_cruzados(inicio, fim))
+    elif executor == 'processos':
+        # Perfeitos e pares saem dos próprios chunks, sem tabela no processo principal
+        with medir('intervalo.chunks'):
+            perfeitos, todos_pares = executar_chunks_processos(dividir_em_chunks(fim, num_threads, engine, tamanho_grao),
+                                                               fim, engine, num_threads)
+        perfeitos = [n for n in perfeitos if n >= inicio]
+    elif executor == 'memoria_compartilhada':
+        with medir('intervalo.chunks'):
+            perfeitos, todos_pares = executar_chunks_memoria_compartilhada(
+                dividir_em_chunks(fim, num_threads, engine, tamanho_grao), fim, engine, num_threads)
+        perfeitos = [n for n in perfeitos if n >= inicio]
+    elif engine != 'divisao':
+        # A mesma tabela atende às duas buscas
+        with medir('intervalo.somas_divisores'):
+            somas = calcular_tabela_somas(fim, engine)
+        with medir('intervalo.perfeitos'):
+            perfeitos = encontrar_numeros_perfeitos_tabela(somas, inicio)
+        with medir('intervalo.pares'):
+            todos_pares = encontrar_pares_amigaveis_paralelo(fim, num_threads, engine, somas,
+                                                             tamanho_grao=tamanho_grao)
+    else:
+        with medir('intervalo.perfeitos'):
+            perfeitos = [n for n in encontrar_numeros_perfeitos(fim, engine) if n >= inicio]
+        with medir('intervalo.pares'):
+            todos_pares = encontrar_pares_amigaveis_paralelo(fim, num_threads, engine, tamanho_grao=tamanho_grao)
+    with medir('intervalo.filtragem'):
+        pares_no_intervalo = [
+            par for par in todos_pares 
+            if par[0] >= inicio or par[1] >= inicio
+        ]
     
     end_time = time.time()
     
@@ -276,12 +992,81 @@ def analisar_intervalo_paralelo(inicio: int, fim: int, num_threads: int = 4) ->
         'total_pares_amigaveis': len(pares_no_intervalo),
         'tempo_execucao': end_time - start_time,
         'threads_utilizadas': num_threads,
-        'metodo': 'chunks'
+        'metodo': 'chunks',
+        'engine': engine,
+        'executor': executor
     }
 
+# Analisa [inicio, fim] de forma incremental: cada estender(novo_fim) divide em
+# chunks apenas a parte nova (fim + 1 a novo_fim) e devolve o resultado do
+# intervalo inteiro até novo_fim. Os pares com o menor elemento na parte nova
+# saem dos chunks; os com o menor elemento já processado vêm das ligações
+# pendentes (n, s(n)) das extensões anteriores, confirmadas pela fatoração de
+# s(n) quando ele entra no intervalo; os com o menor elemento abaixo de inicio
+# são confirmados nos chunks pelo maior elemento (pares_abaixo_de=inicio).
+class AnalisadorIncremental:
+    def __init__(self, inicio: int = 1, num_threads: Optional[int] = None,
+                 executor: str = EXECUTOR_PADRAO, tamanho_grao: Optional[int] = None):
+        self.inicio = max(inicio, 1)
+        self.fim = self.inicio - 1
+        self.num_threads = resolver_num_workers(num_threads, executor)
+        self.executor = resolver_executor(executor)
+        self.tamanho_grao = tamanho_grao
+        self.numeros_perfeitos = []
+        self.pares_amigaveis = []
+        self.pendentes = []  # Ligações (n, s(n)) com s(n) > fim
+        self.tempo_acumulado = 0.0
+
+    # 'tempo_execucao' é o tempo desta extensão; 'tempo_acumulado', o de todas até aqui
+    def estender(self, novo_fim: int) -> Dict:
+        if novo_fim < self.fim:
+            raise ValueError(f"O intervalo só pode ser estendido (fim atual: {self.fim})")
+        start_time = time.time()
+        
+        # Ligações antigas cujo parceiro entrou no intervalo
+        primos = gerar_primos(math.isqrt(novo_fim))
+        ainda_pendentes = []
+        for n, soma_n in self.pendentes:
+            if soma_n > novo_fim:
+                ainda_pendentes.append((n, soma_n))
+            elif calcular_soma_divisores_primos(soma_n, primos) == n:
+                self.pares_amigaveis.append((n, soma_n))
+        
+        # Parte nova, com os parceiros até novo_fim
+        chunks = dividir_em_chunks(novo_fim, self.num_threads, 'crivo', self.tamanho_grao, self.fim + 1)
+        classe_pool = ThreadPoolExecutor if self.executor == 'threads' else ProcessPoolExecutor
+        with classe_pool(max_workers=self.num_threads) as pool:
+            futuros = [pool.submit(processar_chunk_incremental, inicio, fim, novo_fim, self.inicio)
+                       for inicio, fim in chunks]
+            for futuro in futuros:
+                perfeitos_chunk, pares_chunk, pendentes_chunk = futuro.result()
+                self.numeros_perfeitos.extend(perfeitos_chunk)
+                self.pares_amigaveis.extend(pares_chunk)
+                ainda_pendentes.extend(pendentes_chunk)
+        self.pares_amigaveis.sort()
+        self.pendentes = ainda_pendentes
+        self.fim = novo_fim
+        
+        tempo_execucao = time.time() - start_time
+        self.tempo_acumulado += tempo_execucao
+        
+        return {
+            'intervalo': (self.inicio, self.fim),
+            'numeros_perfeitos': list(self.numeros_perfeitos),
+            'pares_amigaveis': list(self.pares_amigaveis),
+            'total_perfeitos': len(self.numeros_perfeitos),
+            'total_pares_amigaveis': len(self.pares_amigaveis),
+            'tempo_execucao': tempo_execucao,
+            'tempo_acumulado': self.tempo_acumulado,
+            'threads_utilizadas': self.num_threads,
+            'metodo': 'incremental',
+            'engine': 'crivo',
+            'executor': self.executor
+        }
+
 def verificar_numero_especifico(n: int) -> Dict:
     soma_divisores = calcular_soma_divisores(n)
-    eh_perfeito = eh_numero_perfeito(n)
+    eh_perfeito = n > 0 and soma_divisores == n
     
     par_amigavel = None
     if soma_divisores != n and calcular_soma_divisores(soma_divisores) == n:
@@ -325,39 +1110,16 @@ if __name__ == "__main__":
               f"Perfeito={resultado['eh_perfeito']}, "
               f"Amigável={resultado['eh_amigavel']}")
     
-    resultado_intervalo = analisar_intervalo_paralelo(1, 100000, num_threads=4)
-    print(f"\nEncontrados no intervalo 1-100000:")
-    print(f"  {resultado_intervalo['total_perfeitos']} números perfeitos")
-    print(f"  {resultado_intervalo['total_pares_amigaveis']} pares amigáveis")
-    print(f"  Tempo: {resultado_intervalo['tempo_execucao']:.3f}s")
-    todos_resultados.append(resultado_intervalo)
-
-    resultado_intervalo2 = analisar_intervalo_paralelo(1, 250000, num_threads=4)
-    print(f"\nEncontrados no intervalo 1-250000:")
-    print(f"  {resultado_intervalo2['total_perfeitos']} números perfeitos")
-    print(f"  {resultado_intervalo2['total_pares_amigaveis']} pares amigáveis")
-    print(f"  Tempo: {resultado_intervalo2['tempo_execucao']:.3f}s")
-    todos_resultados.append(resultado_intervalo2)
-
-    resultado_intervalo3 = analisar_intervalo_paralelo(1, 500000, num_threads=4)
-    print(f"\nEncontrados no intervalo 1-500000:")
-    print(f"  {resultado_intervalo3['total_perfeitos']} números perfeitos")
-    print(f"  {resultado_intervalo3['total_pares_amigaveis']} pares amigáveis")
-    print(f"  Tempo: {resultado_intervalo3['tempo_execucao']:.3f}s")
-    todos_resultados.append(resultado_intervalo3)
-
-    resultado_intervalo4 = analisar_intervalo_paralelo(1, 750000, num_threads=4)
-    print(f"\nEncontrados no intervalo 1-750000:")
-    print(f"  {resultado_intervalo4['total_perfeitos']} números perfeitos")
-    print(f"  {resultado_intervalo4['total_pares_amigaveis']} pares amigáveis")
-    print(f"  Tempo: {resultado_intervalo4['tempo_execucao']:.3f}s")
-    todos_resultados.append(resultado_intervalo4)
-
-    resultado_intervalo5 = analisar_intervalo_paralelo(1, 1000000, num_threads=4)
-    print(f"\nEncontrados no intervalo 1-1000000:")
-    print(f"  {resultado_intervalo5['total_perfeitos']} números perfeitos")
-    print(f"  {resultado_intervalo5['total_pares_amigaveis']} pares amigáveis")
-    print(f"  Tempo: {resultado_intervalo5['tempo_execucao']:.3f}s")
-    todos_resultados.append(resultado_intervalo5)
+    # Cada intervalo estende o anterior: só a parte nova é processada
+    analisador = AnalisadorIncremental(1, num_threads=4, executor='auto')
+    for fim in (100000, 250000, 500000, 750000, 1000000):
+        resultado_intervalo = analisador.estender(fim)
+        print(f"\nEncontrados no intervalo 1-{fim}:")
+        print(f"  {resultado_intervalo['total_perfeitos']} números perfeitos")
+        print(f"  {resultado_intervalo['total_pares_amigaveis']} pares amigáveis")
+        print(f"  Tempo: {resultado_intervalo['tempo_execucao']:.3f}s (acumulado: {resultado_intervalo['tempo_acumulado']:.3f}s)")
+        # No CSV, o tempo de um intervalo é o total até obter o seu resultado
+        resultado_intervalo['tempo_execucao'] = resultado_intervalo['tempo_acumulado']
+        todos_resultados.append(resultado_intervalo)
 
     salvar_csv(todos_resultados)
\ No newline at end of file
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# As abordagens não são um pacote: cada diretório importa os seus módulos pelo
+# nome (checkpoint, fatoracao, ...), que são cópias idênticas entre eles.
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for diretorio in ('Sequencial', 'Paralelo', 'Distribuido', 'Comparacao'):
+    caminho = os.path.join(RAIZ, diretorio)
+    if caminho not in sys.path:
+        sys.path.append(caminho)
@@ -0,0 +1,46 @@
+import perfectOrFriendlyTempo as sequencial
+import perfect_or_friendly_paralelo as paralelo
+import perfect_or_friendly_seq as distribuido
+from benchmark import executar_em_processo
+from cache_somas import CacheSomas
+
+def test_cache_desligado_por_padrao():
+    for modulo in (sequencial, paralelo, distribuido):
+        assert modulo.cache_somas is None
+        assert modulo.estatisticas_cache_somas() == {}
+
+def test_lru_descarta_os_mais_antigos():
+    cache = CacheSomas(limite_denso=10, capacidade_lru=2)
+    for n in (11, 12, 13):
+        cache.guardar(n, n + 1)
+    assert cache.obter(11) is None
+    assert cache.obter(13) == 14
+    assert cache.obter(5) is None
+    cache.guardar(5, 1)
+    assert cache.obter(5) == 1
+    estatisticas = cache.estatisticas()
+    assert (estatisticas['acertos'], estatisticas['faltas'], estatisticas['descartes']) == (2, 2, 1)
+
+# O verificador com threads passa por calcular_somas_lote, que consulta e
+# alimenta o cache compartilhado: a segunda chamada só tem acertos.
+def test_verificador_paralelo_usa_o_cache():
+    numeros = list(range(1, 3000)) + [10**12 + 39, 2**61 - 1]
+    paralelo.configurar_cache_somas()
+    try:
+        primeira = paralelo.verificar_numeros_paralelo(numeros, 4, 'threads')
+        acertos = paralelo.estatisticas_cache_somas()['acertos']
+        segunda = paralelo.verificar_numeros_paralelo(numeros, 4, 'threads')
+        estatisticas = paralelo.estatisticas_cache_somas()
+        assert segunda == primeira
+        assert estatisticas['acertos'] >= acertos + len(numeros) - 1
+    finally:
+        paralelo.configurar_cache_somas(0, 0)
+
+# No processo filho do benchmark o cache fica desligado, para que cada
+# repetição meça o cálculo, a menos que a configuração o ligue.
+def test_benchmark_mede_execucoes_frias():
+    config = {'modo': 'sequencial', 'engine': 'divisao', 'workers': 1, 'inicio': 1, 'fim': 3000,
+              'repeticoes': 2, 'aquecimento': 0, 'porta': 0, 'alvo': 'pares'}
+    assert executar_em_processo(config)['estatisticas_cache'] == {}
+    estatisticas = executar_em_processo({**config, 'cache_somas': True})['estatisticas_cache']
+    assert estatisticas['acertos'] > 0
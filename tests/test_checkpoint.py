@@ -0,0 +1,30 @@
+import pytest
+import perfectOrFriendlyTempo as sequencial
+import perfect_or_friendly_paralelo as paralelo
+
+def sem_tempo(resultado):
+    return {chave: valor for chave, valor in resultado.items() if chave != 'tempo_execucao'}
+
+# Com ou sem checkpoint, a mesma chamada devolve os mesmos pares, inclusive os
+# que cruzam o início; retomar um checkpoint também não muda o resultado.
+@pytest.mark.parametrize('inicio, fim', [(1200, 2000), (10745, 120000)])
+def test_checkpoint_sequencial_igual_ao_sem_checkpoint(tmp_path, inicio, fim):
+    caminho = str(tmp_path / 'varredura.ckpt')
+    esperado = sem_tempo(sequencial.analisar_intervalo(inicio, fim, 'crivo'))
+    assert sem_tempo(sequencial.analisar_intervalo(inicio, fim, checkpoint=caminho)) == esperado
+    assert sem_tempo(sequencial.analisar_intervalo(inicio, fim, checkpoint=caminho)) == esperado
+
+def test_checkpoint_retomado_com_outro_inicio(tmp_path):
+    caminho = str(tmp_path / 'varredura.ckpt')
+    sequencial.analisar_intervalo(1000, 120000, checkpoint=caminho)
+    esperado = sem_tempo(sequencial.analisar_intervalo(10745, 120000, 'crivo'))
+    assert sem_tempo(sequencial.analisar_intervalo(10745, 120000, checkpoint=caminho)) == esperado
+
+@pytest.mark.parametrize('executor', ['threads', 'processos'])
+def test_checkpoint_paralelo_igual_ao_sem_checkpoint(tmp_path, executor):
+    caminho = str(tmp_path / 'varredura.ckpt')
+    esperado = paralelo.analisar_intervalo_paralelo(1200, 70000, 2, 'crivo', executor)
+    resultado = paralelo.analisar_intervalo_paralelo(1200, 70000, 2, 'crivo', executor, checkpoint=caminho)
+    assert resultado['pares_amigaveis'] == esperado['pares_amigaveis']
+    assert resultado['numeros_perfeitos'] == esperado['numeros_perfeitos']
+    assert (1184, 1210) in resultado['pares_amigaveis']
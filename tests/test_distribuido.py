@@ -0,0 +1,51 @@
+import os
+import socket
+import subprocess
+import sys
+import pytest
+import perfectOrFriendlyTempo as sequencial
+import serverTempo
+
+DIRETORIO_DISTRIBUIDO = os.path.dirname(os.path.abspath(serverTempo.__file__))
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+# Coordenador em processo com um cliente local de verdade; grão fixo e pequeno
+# para que cada intervalo seja dividido em várias faixas.
+@pytest.fixture(scope='module')
+def coordenador():
+    porta = porta_livre()
+    coordenador = serverTempo.Coordenador(host='localhost', port=porta, tamanho_grao=3000,
+                                          grao_adaptativo=False, porta_metricas=None)
+    coordenador.iniciar()
+    cliente = subprocess.Popen([sys.executable, 'client.py', '--host', 'localhost', '--port', str(porta)],
+                               cwd=DIRETORIO_DISTRIBUIDO, stdout=subprocess.DEVNULL)
+    try:
+        coordenador.aguardar_trabalhadores(1)
+        yield coordenador
+    finally:
+        coordenador.encerrar()
+        cliente.wait(timeout=30)
+
+# Os pares que cruzam o início global (como (1184, 1210) em 1200-2000) também
+# aparecem na distribuição, reportados pelo cliente que tem o maior elemento.
+@pytest.mark.parametrize('inicio, fim', [(1200, 2000), (2621, 70000), (10745, 120000)])
+def test_distribuicao_concorda_com_sequencial(coordenador, inicio, fim):
+    resultado = coordenador.executar_distribuicao(inicio, fim)
+    referencia = sequencial.analisar_intervalo(inicio, fim, 'crivo')
+    assert resultado['numeros_perfeitos'] == referencia['numeros_perfeitos']
+    assert resultado['pares_amigaveis'] == referencia['pares_amigaveis']
+
+def test_par_que_cruza_o_inicio_distribuido(coordenador):
+    assert coordenador.executar_distribuicao(1200, 2000)['pares_amigaveis'] == [(1184, 1210)]
+
+def test_distribuicao_incremental_com_inicio_maior_que_1(coordenador):
+    distribuicao = serverTempo.DistribuicaoIncremental(coordenador, 1200)
+    for fim in (2000, 20000, 70000):
+        resultado = distribuicao.estender(fim)
+        referencia = sequencial.analisar_intervalo(1200, fim)
+        assert resultado['numeros_perfeitos'] == referencia['numeros_perfeitos']
+        assert resultado['pares_amigaveis'] == referencia['pares_amigaveis']
@@ -0,0 +1,15 @@
+import escalabilidade
+
+def ponto(workers, tempo, serial):
+    return {'workers': workers, 'tempo_mediana': tempo, 'trabalho_serial': serial}
+
+# Com a tabela montada em série (threads + crivo), a fração serial não é calculada.
+def test_fracao_serial_omitida_em_trabalho_serial():
+    assert escalabilidade.trabalho_serial('threads', 'crivo')
+    assert not escalabilidade.trabalho_serial('threads', 'divisao')
+    assert not escalabilidade.trabalho_serial('processos', 'crivo')
+
+    seriais = escalabilidade.calcular_metricas([ponto(1, 2.0, True), ponto(2, 2.0, True)], 'forte')
+    assert seriais[1]['fracao_serial'] is None
+    paralelos = escalabilidade.calcular_metricas([ponto(1, 2.0, False), ponto(2, 1.25, False)], 'forte')
+    assert abs(paralelos[1]['fracao_serial'] - 0.25) < 1e-12
@@ -0,0 +1,36 @@
+import pytest
+import perfectOrFriendlyTempo as sequencial
+import perfect_or_friendly_seq as distribuido
+
+INTERVALOS = [(1200, 2000), (2621, 70000), (10745, 120000)]
+
+def sem_tempo(resultado):
+    return {chave: valor for chave, valor in resultado.items() if chave != 'tempo_execucao'}
+
+# A engine só muda a velocidade: com inicio > 1, os pares que cruzam o início
+# (como (1184, 1210) em 1200-2000) aparecem em todas.
+@pytest.mark.parametrize('modulo', [sequencial, distribuido])
+@pytest.mark.parametrize('inicio, fim', INTERVALOS)
+def test_engines_concordam_com_inicio_maior_que_1(modulo, inicio, fim):
+    referencia = sem_tempo(modulo.analisar_intervalo(inicio, fim, 'crivo'))
+    for engine in modulo.ENGINES:
+        assert sem_tempo(modulo.analisar_intervalo(inicio, fim, engine)) == referencia, engine
+
+def test_par_que_cruza_o_inicio():
+    resultado = sequencial.analisar_intervalo(1200, 2000, 'segmentado')
+    assert resultado['pares_amigaveis'] == [(1184, 1210)]
+
+# Na divisão entre janelas, cada par continua só na janela do menor elemento.
+def test_janela_segmentada_mantem_atribuicao_pelo_menor_elemento():
+    _, pares = sequencial.analisar_janela_segmentada(1200, 2000, 2000)
+    assert pares == []
+
+# Estender a partir de inicio > 1 dá o mesmo resultado da análise direta,
+# inclusive os pares que cruzam o início (é o caminho padrão do relatório).
+def test_analisador_incremental_com_inicio_maior_que_1():
+    analisador = sequencial.AnalisadorIncremental(1200)
+    for fim in (2000, 20000, 70000):
+        resultado = analisador.estender(fim)
+        referencia = sequencial.analisar_intervalo(1200, fim)
+        assert resultado['numeros_perfeitos'] == referencia['numeros_perfeitos']
+        assert resultado['pares_amigaveis'] == referencia['pares_amigaveis']
@@ -0,0 +1,19 @@
+import os
+import perfect_or_friendly_paralelo as paralelo
+
+# Sem num_threads, o executor 'threads' mantém as 4 threads originais; os
+# executores de processos usam um worker por núcleo.
+def test_num_threads_padrao():
+    assert paralelo.analisar_intervalo_paralelo(1, 3000)['threads_utilizadas'] == 4
+    resultado = paralelo.analisar_intervalo_paralelo(1, 3000, executor='processos')
+    assert resultado['threads_utilizadas'] == (os.cpu_count() or 1)
+    assert paralelo.resolver_num_workers(None, 'auto') == (os.cpu_count() or 1)
+    assert paralelo.resolver_num_workers(3, 'threads') == 3
+
+def test_analisador_incremental_com_inicio_maior_que_1():
+    analisador = paralelo.AnalisadorIncremental(1200, num_threads=2)
+    for fim in (2000, 20000, 70000):
+        resultado = analisador.estender(fim)
+        referencia = paralelo.analisar_intervalo_paralelo(1200, fim, num_threads=2)
+        assert resultado['numeros_perfeitos'] == referencia['numeros_perfeitos']
+        assert resultado['pares_amigaveis'] == referencia['pares_amigaveis']
@@ -0,0 +1,28 @@
+import itertools
+import perfectOrFriendlyTempo as sequencial
+import perfect_or_friendly_seq as distribuido
+
+# Sem fim, os perfeitos vêm dos primos de Mersenne: os 12 primeiros saem na
+# hora, sem percorrer os inteiros até 2^126.
+def test_iter_perfeitos_sem_fim():
+    for modulo in (sequencial, distribuido):
+        perfeitos = list(itertools.islice(modulo.iter_perfeitos(), 12))
+        assert perfeitos[:4] == [6, 28, 496, 8128]
+        assert perfeitos[-1] == (1 << 126) * ((1 << 127) - 1)
+        assert next(modulo.iter_perfeitos(100)) == 496
+
+def test_iter_perfeitos_com_fim():
+    assert list(sequencial.iter_perfeitos(1, 10000)) == [6, 28, 496, 8128]
+    assert list(sequencial.iter_perfeitos(30, 10000)) == [496, 8128]
+
+# Estender o cache de expoentes entre dois next() não faz o gerador pular perfeitos.
+def test_iter_perfeitos_pares_intercalado_com_outras_buscas(monkeypatch):
+    for modulo in (sequencial, distribuido):
+        # Cache de expoentes vazio, como no início do processo
+        monkeypatch.setattr(modulo, 'expoentes_mersenne', [])
+        monkeypatch.setattr(modulo, 'maior_expoente_testado', 1)
+        gerador = modulo.iter_numeros_perfeitos_pares()
+        assert [next(gerador), next(gerador)] == [6, 28]
+        modulo.encontrar_numeros_perfeitos(10**40, 'divisao')
+        modulo.calcular_expoentes_mersenne(200)
+        assert [next(gerador), next(gerador), next(gerador)] == [496, 8128, 33550336]